@@ -0,0 +1,30 @@
+from django.urls import URLPattern, include, path
+
+from api.async_views import as_async_view
+from api.urls import router_v1
+from api.views import (
+    CommentViewSet,
+    ExportView,
+    ReviewViewSet,
+    TitleViewSet,
+)
+
+ASYNC_VIEWSETS = (TitleViewSet, ReviewViewSet, CommentViewSet)
+
+urlpatterns = [
+    path(
+        'v1/export/<str:resource>/',
+        as_async_view(ExportView.as_view(spool_export=True)),
+        name='export'
+    ),
+    path('v1/', include([
+        URLPattern(
+            pattern.pattern,
+            as_async_view(pattern.callback),
+            pattern.default_args,
+            pattern.name,
+        )
+        for pattern in router_v1.urls
+        if getattr(pattern.callback, 'cls', None) in ASYNC_VIEWSETS
+    ])),
+]
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from api_yamdb.settings import ASYNC_DB_THREADS
+
+db_executor = ThreadPoolExecutor(
+    max_workers=ASYNC_DB_THREADS, thread_name_prefix='api-db'
+)
+
+
+def _close_broken_connections():
+    """Закрытие соединений потока, сломанных ошибкой запроса.
+
+    Остальные соединения живут вместе с потоком пула, поэтому их число
+    ограничено ASYNC_DB_THREADS и не открывается заново на каждый запрос.
+    """
+
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        if connection.in_atomic_block or (
+            connection.errors_occurred and not connection.is_usable()
+        ):
+            connection.close()
+        connection.errors_occurred = False
+
+
+def _run_view(view, request, *args, **kwargs):
+    """Вызов синхронного представления в потоке пула.
+
+    Ответ рендерится здесь же, а не в общем потоке обработчика ASGI.
+    """
+
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            response.render()
+        return response
+    finally:
+        _close_broken_connections()
+
+
+def as_async_view(view):
+    """Асинхронная обертка представления DRF для ASGI.
+
+    Чтения параллельно выполняются в ограниченном пуле db_executor,
+    запись остается в общем потоке sync_to_async, как у Django.
+    """
+
+    run_in_pool = sync_to_async(
+        _run_view, thread_sensitive=False, executor=db_executor
+    )
+    run_in_main_thread = sync_to_async(view)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return await run_in_pool(view, request, *args, **kwargs)
+        return await run_in_main_thread(request, *args, **kwargs)
+
+    return async_view
@@ -0,0 +1,127 @@
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api_yamdb.settings import (
+    JWT_ROLE_CLAIMS,
+    TOKEN_VERSION_CACHE_TIMEOUT,
+    USER_CACHE_TIMEOUT,
+)
+from users.models import User
+from .cache import get_token_version_cache_key, get_user_cache_key
+
+TOKEN_VERSION_CLAIM = 'token_version'
+ROLE_CLAIMS = ('role', 'is_superuser')
+# Поля пользователя в кеше: только нужные для аутентификации и прав.
+CACHED_USER_FIELDS = (
+    'id',
+    'username',
+    'role',
+    'is_staff',
+    'is_superuser',
+    'is_active',
+    'token_version',
+)
+
+
+def build_user(data):
+    """Пользователь из словаря значений; остальные поля отложены."""
+
+    # from_db ожидает значения в порядке полей модели.
+    field_names = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in data
+    ]
+    return User.from_db(
+        User.objects.db,
+        field_names,
+        [data[name] for name in field_names],
+    )
+
+
+def get_access_token(user):
+    """Токен доступа; при JWT_ROLE_CLAIMS в него пишутся роль и версия."""
+
+    token = AccessToken.for_user(user)
+    if JWT_ROLE_CLAIMS:
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
+
+
+def get_token_version(user_id):
+    """Текущая версия токенов активного пользователя или None."""
+
+    key = get_token_version_cache_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id,
+            is_active=True,
+        ).values_list('token_version', flat=True).first()
+        if version is not None:
+            cache.set(key, version, TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация с кешированием пользователя по id.
+
+    В кеш попадают только поля CACHED_USER_FIELDS пользователей,
+    прошедших проверки JWTAuthentication, без пароля и профиля.
+    Пользователь собирается из них с отложенными остальными полями.
+    Запись удаляется сигналом при любом сохранении или удалении
+    пользователя, поэтому смена роли, is_active и is_superuser действует
+    со следующего запроса.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        key = get_user_cache_key(user_id)
+        data = cache.get(key)
+        if data is not None:
+            return build_user(data)
+        user = super().get_user(validated_token)
+        cache.set(
+            key,
+            {field: getattr(user, field) for field in CACHED_USER_FIELDS},
+            USER_CACHE_TIMEOUT,
+        )
+        return user
+
+
+class RoleJWTAuthentication(CachedJWTAuthentication):
+    """Аутентификация по токенам с ролью без загрузки пользователя.
+
+    Пользователь собирается из claims как экземпляр User с отложенными
+    полями: права проверяются без запросов, а остальные поля
+    подгружаются при первом обращении. Токен принимается, только если
+    его версия совпадает с token_version пользователя, которая растет
+    при смене роли, is_superuser и is_active. Токены без версии
+    обрабатываются как обычно.
+    """
+
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        version = validated_token[TOKEN_VERSION_CLAIM]
+        if get_token_version(user_id) != version:
+            raise AuthenticationFailed(
+                _('Token is invalid or expired'),
+                code='token_not_valid',
+            )
+        return build_user({
+            'id': user_id,
+            'is_active': True,
+            'token_version': version,
+            **{claim: validated_token.get(claim) for claim in ROLE_CLAIMS},
+        })
@@ -0,0 +1,96 @@
+import time
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .db_routers import mark_recent_write
+
+TITLES_CACHE_PREFIX = 'titles'
+REVIEWS_CACHE_PREFIX = 'reviews'
+
+
+def _get_version_key(prefix):
+    return f'api:{prefix}:version'
+
+
+def _get_initial_version():
+    # Начинаем с текущего времени, чтобы после вытеснения ключа из кеша
+    # версия не совпала с уже выданной клиентам.
+    return int(time.time() * 1000)
+
+
+def get_user_cache_key(user_id):
+    return f'api:user:{user_id}'
+
+
+def get_token_version_cache_key(user_id):
+    return f'api:user:{user_id}:token_version'
+
+
+def get_cache_version(prefix):
+    """Текущая версия кеша ответов с данным префиксом."""
+
+    version_key = _get_version_key(prefix)
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, _get_initial_version(), timeout=None)
+        version = cache.get(version_key)
+    return version
+
+
+def bump_cache_version(prefix):
+    """Инвалидация всех ответов с данным префиксом сменой версии."""
+
+    # Отметка ставится до смены версии, чтобы ответ из отстающей реплики
+    # не попал в кеш и не получил ETag под новой версией.
+    mark_recent_write(prefix)
+    version_key = _get_version_key(prefix)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.add(version_key, _get_initial_version(), timeout=None)
+
+
+def get_request_digest(request, *extra, exclude=()):
+    """Хеш пути, параметров запроса и заголовка Accept."""
+
+    query = urlencode(
+        sorted(
+            (param, values) for param, values in request.GET.lists()
+            if param not in exclude
+        ),
+        doseq=True,
+    )
+    return md5(
+        '\n'.join((
+            request.path,
+            query,
+            request.META.get('HTTP_ACCEPT', ''),
+            *map(str, extra),
+        )).encode()
+    ).hexdigest()
+
+
+def get_response_cache_key(request, prefix):
+    """Ключ кеша ответа с учетом текущей версии данных."""
+
+    digest = get_request_digest(request)
+    return f'api:{prefix}:{get_cache_version(prefix)}:{digest}'
+
+
+def dump_response(response):
+    """Сериализация отрендеренного ответа для хранения в кеше."""
+
+    return response.content, response.status_code, list(response.items())
+
+
+def load_response(cached):
+    """Восстановление ответа из кеша без ORM, сериализатора и рендера."""
+
+    content, status, headers = cached
+    response = HttpResponse(content, status=status)
+    for header, value in headers:
+        response[header] = value
+    return response
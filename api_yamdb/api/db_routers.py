@@ -0,0 +1,107 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from api_yamdb.settings import (
+    DATABASE_REPLICAS,
+    REPLICA_LAG_TIMEOUT,
+    REPLICA_STICKY_TIMEOUT,
+)
+
+_read_database = ContextVar('read_database', default=None)
+
+
+def _get_sticky_key(user_id):
+    return f'api:db:sticky:{user_id}'
+
+
+def _get_recent_write_key(prefix):
+    return f'api:db:recent_write:{prefix}'
+
+
+def mark_recent_write(prefix):
+    """Отметка смены данных с префиксом кеша prefix.
+
+    Отметка живет REPLICA_LAG_TIMEOUT секунд, пока реплики догоняют
+    основную базу.
+    """
+
+    if DATABASE_REPLICAS:
+        cache.set(_get_recent_write_key(prefix), True, REPLICA_LAG_TIMEOUT)
+
+
+def is_stale_read(alias, prefix):
+    """Могли ли данные с префиксом prefix прочитаться из отстающей реплики.
+
+    Такой ответ нельзя класть в кеш и подтверждать ETag: под новой
+    версией данных он сохранил бы старые строки.
+    """
+
+    return (
+        alias is not None
+        and prefix is not None
+        and cache.get(_get_recent_write_key(prefix)) is not None
+    )
+
+
+def choose_read_database(user):
+    """Реплика для чтения в запросе пользователя или None.
+
+    None означает основную базу: реплик нет или пользователь недавно
+    писал данные и должен сразу видеть свои изменения.
+    """
+
+    if not DATABASE_REPLICAS:
+        return None
+    if user.is_authenticated and cache.get(_get_sticky_key(user.pk)):
+        return None
+    return random.choice(DATABASE_REPLICAS)
+
+
+def stick_to_primary(user):
+    """Направление чтений пользователя в основную базу после записи."""
+
+    if user.is_authenticated:
+        cache.set(_get_sticky_key(user.pk), True, REPLICA_STICKY_TIMEOUT)
+
+
+def set_read_database(alias):
+    return _read_database.set(alias)
+
+
+def reset_read_database(token):
+    _read_database.reset(token)
+
+
+@contextmanager
+def use_read_database(alias):
+    """Чтение из указанной базы внутри блока with."""
+
+    token = set_read_database(alias)
+    try:
+        yield
+    finally:
+        reset_read_database(token)
+
+
+class ReplicaRouter:
+    """Роутер чтения из реплики, выбранной для текущего запроса.
+
+    Вне запросов с ReplicaReadMixin чтение и запись идут в основную
+    базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
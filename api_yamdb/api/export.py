@@ -0,0 +1,142 @@
+import csv
+import tempfile
+import zlib
+from contextlib import contextmanager
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from api_yamdb.settings import EXPORT_CHUNK_SIZE, EXPORT_SPOOL_MAX_SIZE
+from reviews.models import Comment, Review, Title
+
+EXPORT_SPECS = {
+    'titles': (
+        Title,
+        (
+            'id',
+            'name',
+            'year',
+            'description',
+            'category_id',
+            'rating',
+            'review_count',
+        ),
+    ),
+    'reviews': (
+        Review,
+        ('id', 'title_id', 'author_id', 'text', 'score', 'pub_date'),
+    ),
+    'comments': (
+        Comment,
+        ('id', 'review_id', 'author_id', 'text', 'pub_date'),
+    ),
+}
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+EXPORT_GZIP_CONTENT_TYPE = 'application/gzip'
+
+
+class Echo:
+    """Буфер для csv.writer, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+@contextmanager
+def snapshot(using=DEFAULT_DB_ALIAS):
+    """Транзакция только на чтение с согласованным снимком данных."""
+
+    connection = connections[using]
+    outermost = not connection.in_atomic_block
+    with transaction.atomic(using=using, savepoint=False):
+        if outermost and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY'
+                )
+        yield
+
+
+def iter_rows(resource, using=DEFAULT_DB_ALIAS):
+    model, fields = EXPORT_SPECS[resource]
+    return model.objects.using(using).order_by('pk').values_list(
+        *fields
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def iter_ndjson(resource, rows):
+    _, fields = EXPORT_SPECS[resource]
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+def iter_csv(resource, rows):
+    _, fields = EXPORT_SPECS[resource]
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+EXPORT_WRITERS = {
+    'ndjson': iter_ndjson,
+    'csv': iter_csv,
+}
+
+
+def iter_chunks(lines):
+    """Склейка строк в блоки, чтобы не отдавать ответ по одной строке."""
+
+    while True:
+        chunk = ''.join(islice(lines, EXPORT_CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk.encode()
+
+
+def iter_gzip(chunks):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_export(resource, export_format='ndjson', compress=False,
+                using=DEFAULT_DB_ALIAS):
+    """Потоковая выгрузка таблицы блоками байтов.
+
+    Запрос выполняется внутри транзакции, которая открывается
+    при первом чтении генератора и закрывается после последнего блока.
+    """
+
+    with snapshot(using):
+        lines = EXPORT_WRITERS[export_format](
+            resource, iter_rows(resource, using)
+        )
+        chunks = iter_chunks(lines)
+        if compress:
+            chunks = iter_gzip(chunks)
+        yield from chunks
+
+
+def spool_export(resource, export_format='ndjson', compress=False,
+                 using=DEFAULT_DB_ALIAS):
+    """Выгрузка таблицы во временный файл, открытый с начала.
+
+    Под ASGI ответ отдается в цикле событий, где ORM недоступен,
+    поэтому данные читаются заранее, в потоке представления.
+    До EXPORT_SPOOL_MAX_SIZE байт файл остается в памяти.
+    """
+
+    spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+    for chunk in iter_export(resource, export_format, compress, using):
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
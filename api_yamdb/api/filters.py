@@ -1,6 +1,7 @@
 from django_filters import rest_framework
 
 from reviews.models import Title
+from reviews.search import get_search_backend
 
 
 class TitleFilter(rest_framework.FilterSet):
@@ -9,6 +10,7 @@ class TitleFilter(rest_framework.FilterSet):
     name = rest_framework.CharFilter(lookup_expr='iexact')
     category = rest_framework.CharFilter(field_name='category__slug')
     genre = rest_framework.CharFilter(field_name='genre__slug')
+    search = rest_framework.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
@@ -17,4 +19,8 @@ class TitleFilter(rest_framework.FilterSet):
             'category',
             'genre',
             'year',
+            'search',
         )
+
+    def filter_search(self, queryset, name, value):
+        return get_search_backend(queryset.db).search(queryset, value)
@@ -0,0 +1,162 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+
+from api.authentication import get_access_token
+from api_yamdb.settings import ASYNC_DB_THREADS
+from users.models import User
+
+ASGI_URLCONF_MIDDLEWARE = 'api.middleware.asgi_urlconf_middleware'
+
+
+class Command(BaseCommand):
+    """Сравнение пропускной способности чтения под WSGI и ASGI."""
+
+    help = (
+        'Отправляет параллельные GET-запросы к API через тестовые клиенты '
+        'WSGI и ASGI и сравнивает количество обработанных запросов '
+        'в секунду. Запросы отправляются от имени пользователя, чтобы '
+        'ответы не брались из кеша анонимных ответов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='*',
+            default=['/api/v1/titles/'],
+            help='Адреса для GET-запросов, по умолчанию /api/v1/titles/.',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=50,
+            help=(
+                'Одновременных соединений: потоков WSGI или корутин ASGI.'
+            ),
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Количество запросов в каждом режиме.',
+        )
+        parser.add_argument(
+            '--username',
+            help=(
+                'Пользователь, от имени которого идут запросы, '
+                'по умолчанию первый активный.'
+            ),
+        )
+        parser.add_argument(
+            '--anonymous',
+            action='store_true',
+            help=(
+                'Анонимные запросы: ответы списка произведений будут '
+                'отдаваться из кеша анонимных ответов.'
+            ),
+        )
+
+    def get_urls(self, options):
+        paths = options['paths']
+        return [paths[idx % len(paths)] for idx in range(options['requests'])]
+
+    def get_user(self, options):
+        if options['anonymous']:
+            return None
+        users = User.objects.filter(is_active=True).order_by('pk')
+        if options['username']:
+            users = users.filter(username=options['username'])
+        user = users.first()
+        if user is None:
+            raise CommandError(
+                'Не найден активный пользователь для запросов, '
+                'укажите --username или --anonymous.'
+            )
+        return user
+
+    def run_wsgi(self, urls, concurrency, authorization):
+        headers = (
+            {'HTTP_AUTHORIZATION': authorization} if authorization else {}
+        )
+
+        def get(url):
+            return Client(**headers).get(url).status_code
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(get, urls))
+
+    def run_asgi(self, urls, concurrency, authorization):
+        # AsyncClient в Django 3.2 берет заголовки только из аргументов
+        # запроса, а не из настроек клиента.
+        headers = {'authorization': authorization} if authorization else {}
+
+        async def main():
+            client = AsyncClient()
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def get(url):
+                async with semaphore:
+                    return (await client.get(url, **headers)).status_code
+
+            return await asyncio.gather(*(get(url) for url in urls))
+
+        return asyncio.run(main())
+
+    def run_asgi_sync_views(self, urls, concurrency, authorization):
+        middleware = [
+            name for name in settings.MIDDLEWARE
+            if name != ASGI_URLCONF_MIDDLEWARE
+        ]
+        with override_settings(MIDDLEWARE=middleware):
+            return self.run_asgi(urls, concurrency, authorization)
+
+    def handle(self, *args, **options):
+        urls = self.get_urls(options)
+        concurrency = options['concurrency']
+        user = self.get_user(options)
+        authorization = user and f'Bearer {get_access_token(user)}'
+        modes = {
+            'WSGI': self.run_wsgi,
+            'ASGI, синхронные представления': self.run_asgi_sync_views,
+            'ASGI, асинхронные представления': self.run_asgi,
+        }
+        results = {}
+        for name, run in modes.items():
+            start = time.perf_counter()
+            statuses = run(urls, concurrency, authorization)
+            elapsed = time.perf_counter() - start
+            failed = [status for status in statuses if status != 200]
+            if failed:
+                raise CommandError(
+                    f'{name}: {len(failed)} запросов завершились с ошибкой, '
+                    f'например со статусом {failed[0]}.'
+                )
+            results[name] = len(urls) / elapsed
+
+        self.stdout.write(
+            f'{len(urls)} запросов, {concurrency} одновременных соединений'
+        )
+        if user:
+            self.stdout.write(
+                f'Запросы от имени {user.username}: кеш анонимных ответов '
+                'не используется, замеряется обработка представлений'
+            )
+        else:
+            self.stdout.write(
+                'Анонимные запросы: ответы могут отдаваться из кеша '
+                'анонимных ответов без обращения к базе'
+            )
+        for name, rate in results.items():
+            self.stdout.write(f'{name}: {rate:.0f} запросов/с')
+        self.stdout.write(
+            f'Потоков для запросов: WSGI {concurrency}, '
+            f'ASGI {ASYNC_DB_THREADS} (ASYNC_DB_THREADS)'
+        )
+        speedup = results['ASGI, асинхронные представления'] / results['WSGI']
+        self.stdout.write(
+            self.style.SUCCESS(f'ASGI против WSGI: x{speedup:.2f}')
+        )
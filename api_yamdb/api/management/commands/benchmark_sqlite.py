@@ -0,0 +1,164 @@
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from api.sqlite import apply_pragmas
+from api_yamdb.settings import SQLITE_PRAGMAS
+
+# Таймаут, с которым Django открывает SQLite без OPTIONS.
+DEFAULT_TIMEOUT = 5
+TITLES_COUNT = 100
+
+
+class Command(BaseCommand):
+    """Сравнение SQLite по умолчанию и с SQLITE_PRAGMAS под нагрузкой."""
+
+    help = (
+        'Замеряет чтения и записи отзывов в секунду из параллельных '
+        'потоков на временной базе SQLite с настройками по умолчанию '
+        'и с SQLITE_PRAGMAS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--readers',
+            type=int,
+            default=4,
+            help='Количество читающих потоков.',
+        )
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=2,
+            help='Количество пишущих потоков.',
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=5,
+            help='Длительность замера каждого режима в секундах.',
+        )
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=10000,
+            help='Количество отзывов в базе перед замером.',
+        )
+
+    def connect(self, path, pragmas):
+        connection = sqlite3.connect(
+            path, timeout=DEFAULT_TIMEOUT, isolation_level=None
+        )
+        apply_pragmas(connection, pragmas)
+        return connection
+
+    def prepare(self, path, rows):
+        connection = sqlite3.connect(path, isolation_level=None)
+        connection.executescript(
+            'CREATE TABLE review ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'title_id INTEGER NOT NULL, '
+            'score INTEGER NOT NULL, '
+            'text TEXT NOT NULL);'
+            'CREATE INDEX review_title_idx ON review (title_id);'
+        )
+        connection.execute('BEGIN')
+        connection.executemany(
+            'INSERT INTO review (title_id, score, text) VALUES (?, ?, ?)',
+            (
+                (idx % TITLES_COUNT, idx % 10 + 1, 'Текст отзыва')
+                for idx in range(rows)
+            ),
+        )
+        connection.execute('COMMIT')
+        connection.close()
+
+    def run_mode(self, path, pragmas, options):
+        counters = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+        deadline = []
+        start = threading.Barrier(
+            options['readers'] + options['writers'],
+            action=lambda: deadline.append(
+                time.monotonic() + options['duration']
+            ),
+        )
+
+        def worker(operation):
+            connection = self.connect(path, pragmas)
+            done = errors = 0
+            start.wait()
+            while time.monotonic() < deadline[0]:
+                try:
+                    operation(connection, random.randrange(TITLES_COUNT))
+                    done += 1
+                except sqlite3.OperationalError:
+                    errors += 1
+            connection.close()
+            key = 'writes' if operation is write else 'reads'
+            with lock:
+                counters[key] += done
+                counters['errors'] += errors
+
+        def read(connection, title_id):
+            connection.execute(
+                'SELECT COUNT(*), AVG(score) FROM review WHERE title_id = ?',
+                (title_id,),
+            ).fetchall()
+
+        def write(connection, title_id):
+            connection.execute(
+                'INSERT INTO review (title_id, score, text) VALUES (?, ?, ?)',
+                (title_id, random.randint(1, 10), 'Новый отзыв'),
+            )
+
+        threads = [
+            threading.Thread(target=worker, args=(read,))
+            for _ in range(options['readers'])
+        ] + [
+            threading.Thread(target=worker, args=(write,))
+            for _ in range(options['writers'])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {
+            key: value / options['duration'] if key != 'errors' else value
+            for key, value in counters.items()
+        }
+
+    def handle(self, *args, **options):
+        modes = {
+            'По умолчанию': {},
+            'SQLITE_PRAGMAS': SQLITE_PRAGMAS,
+        }
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for index, (name, pragmas) in enumerate(modes.items()):
+                path = str(Path(directory) / f'benchmark{index}.sqlite3')
+                self.prepare(path, options['rows'])
+                results[name] = self.run_mode(path, pragmas, options)
+
+        self.stdout.write(
+            f'Потоков: {options["readers"]} читающих, '
+            f'{options["writers"]} пишущих, {options["duration"]:g} с '
+            'на режим'
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name}: {result["reads"]:.0f} чтений/с, '
+                f'{result["writes"]:.0f} записей/с, '
+                f'ошибок блокировки {result["errors"]}'
+            )
+        before, after = results.values()
+        for key, label in (('reads', 'чтений'), ('writes', 'записей')):
+            if before[key]:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Ускорение {label}: x{after[key] / before[key]:.2f}'
+                ))
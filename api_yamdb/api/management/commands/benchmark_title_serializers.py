@@ -0,0 +1,110 @@
+from timeit import repeat
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.serializers import TitleReadSerializer, TitleValuesSerializer
+from api.views import TitleViewSet
+from reviews.models import Category, Genre, GenreTitle, Title
+
+
+class Command(BaseCommand):
+    """Сравнение TitleReadSerializer и быстрого values()-сериалайзера."""
+
+    help = (
+        'Сравнивает время сериализации страницы произведений '
+        'через TitleReadSerializer и TitleValuesSerializer.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=100,
+            help='Размер страницы произведений.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Количество повторов замера.',
+        )
+        parser.add_argument(
+            '--fill',
+            type=int,
+            default=0,
+            help=(
+                'Создать столько временных произведений на время замера '
+                '(данные откатываются).'
+            ),
+        )
+
+    def fill(self, count):
+        category = Category.objects.create(name='Бенчмарк', slug='bench')
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx}', slug=f'bench-{idx}')
+            for idx in range(2)
+        )
+        Title.objects.bulk_create(
+            Title(
+                name=f'Произведение {idx}',
+                year=2000,
+                description='Описание',
+                category=category,
+            )
+            for idx in range(count)
+        )
+        genre_ids = Genre.objects.filter(
+            slug__startswith='bench-',
+        ).values_list('pk', flat=True)
+        title_ids = category.titles.values_list('pk', flat=True)
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title_id=title_id, genre_id=genre_id)
+            for title_id in title_ids
+            for genre_id in genre_ids
+        )
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        renderer = JSONRenderer()
+        queryset = TitleViewSet.queryset.all()
+
+        def model_path():
+            return renderer.render(
+                TitleReadSerializer(queryset[:limit], many=True).data
+            )
+
+        def values_path():
+            values = TitleValuesSerializer.get_values_queryset(queryset)
+            return renderer.render(
+                TitleValuesSerializer(values[:limit], many=True).data
+            )
+
+        with transaction.atomic():
+            if options['fill']:
+                self.fill(options['fill'])
+            if model_path() != values_path():
+                raise CommandError(
+                    'Ответы сериалайзеров различаются.'
+                )
+            results = {
+                'TitleReadSerializer': repeat(
+                    model_path, number=1, repeat=options['repeat']
+                ),
+                'TitleValuesSerializer': repeat(
+                    values_path, number=1, repeat=options['repeat']
+                ),
+            }
+            transaction.set_rollback(True)
+
+        for name, timings in results.items():
+            self.stdout.write(
+                f'{name}: лучшее {min(timings) * 1000:.2f} мс, '
+                f'среднее {sum(timings) / len(timings) * 1000:.2f} мс '
+                f'на страницу из {limit} произведений'
+            )
+        speedup = min(results['TitleReadSerializer']) / min(
+            results['TitleValuesSerializer']
+        )
+        self.stdout.write(self.style.SUCCESS(f'Ускорение: x{speedup:.2f}'))
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from api.export import EXPORT_SPECS, EXPORT_WRITERS, iter_export, snapshot
+
+
+class Command(BaseCommand):
+    """Потоковая выгрузка произведений, отзывов и комментариев."""
+
+    help = (
+        'Выгружает таблицы titles, reviews и comments в NDJSON или CSV '
+        'с постоянным расходом памяти.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'resources',
+            nargs='*',
+            help=(
+                f'Таблицы для выгрузки: {", ".join(EXPORT_SPECS)}. '
+                'По умолчанию все.'
+            ),
+        )
+        parser.add_argument(
+            '--type',
+            dest='export_format',
+            choices=list(EXPORT_WRITERS),
+            default='ndjson',
+            help='Формат выгрузки.',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать выгрузку gzip.',
+        )
+        parser.add_argument(
+            '--output',
+            help=(
+                'Папка для файлов <resource>.<type>[.gz]. Без нее выгрузка '
+                'одной таблицы пишется в stdout.'
+            ),
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='База данных для выгрузки.',
+        )
+
+    def handle(self, *args, **options):
+        resources = options['resources'] or list(EXPORT_SPECS)
+        unknown = set(resources) - set(EXPORT_SPECS)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные таблицы: {", ".join(sorted(unknown))}.'
+            )
+        output = options['output']
+        if output is None and len(resources) > 1:
+            raise CommandError(
+                'Для выгрузки нескольких таблиц укажите папку --output.'
+            )
+        stdout_buffer = getattr(self.stdout, 'buffer', None)
+        if output is None and options['gzip'] and stdout_buffer is None:
+            raise CommandError(
+                'Сжатую выгрузку можно записать только в файл или '
+                'двоичный поток.'
+            )
+        # Все таблицы читаются в одной транзакции с общим снимком.
+        with snapshot(options['database']):
+            for resource in resources:
+                chunks = iter_export(
+                    resource,
+                    options['export_format'],
+                    options['gzip'],
+                    options['database'],
+                )
+                if output is None:
+                    for chunk in chunks:
+                        if options['gzip']:
+                            stdout_buffer.write(chunk)
+                        else:
+                            # Блоки состоят из целых строк и
+                            # декодируются по отдельности.
+                            self.stdout.write(chunk.decode(), ending='')
+                    continue
+                filename = f'{resource}.{options["export_format"]}'
+                if options['gzip']:
+                    filename += '.gz'
+                path = Path(output) / filename
+                with open(path, 'wb') as export_file:
+                    for chunk in chunks:
+                        export_file.write(chunk)
+                self.stderr.write(f'{resource}: {path}')
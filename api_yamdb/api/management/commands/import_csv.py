@@ -0,0 +1,229 @@
+import csv
+import time
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F
+
+from api.cache import (
+    REVIEWS_CACHE_PREFIX,
+    TITLES_CACHE_PREFIX,
+    bump_cache_version,
+    get_token_version_cache_key,
+    get_user_cache_key,
+)
+from api_yamdb.settings import BASE_DIR
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+    TitleScore,
+    TopTitle,
+)
+from reviews.search import get_search_backend
+from users.models import User
+
+# Файлы в порядке зависимостей и переименование колонок в attname полей.
+IMPORT_SPECS = (
+    ('users.csv', User, {}),
+    ('category.csv', Category, {}),
+    ('genre.csv', Genre, {}),
+    ('titles.csv', Title, {'category': 'category_id'}),
+    ('genre_title.csv', GenreTitle, {}),
+    ('review.csv', Review, {'author': 'author_id'}),
+    ('comments.csv', Comment, {'author': 'author_id'}),
+)
+
+
+@contextmanager
+def auto_now_disabled(model):
+    """Сохранение дат из файла вместо подстановки текущего времени."""
+
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    """Потоковая загрузка CSV-файлов пакетами bulk_create."""
+
+    help = (
+        'Загружает users, category, genre, titles, genre_title, review и '
+        'comments из CSV-файлов. Повторный запуск обновляет существующие '
+        'записи по id.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=BASE_DIR / 'static' / 'data',
+            help='Папка с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк в одной пакетной вставке.',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='База данных для загрузки.',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        self.batch_size = options['batch_size']
+        self.using = options['database']
+        if self.batch_size < 1:
+            raise CommandError('Размер пакета должен быть положительным.')
+        self.unusable_password = make_password(None)
+        connection = connections[self.using]
+        self.updated_user_ids = []
+
+        started = time.monotonic()
+        total = 0
+        with transaction.atomic(using=self.using):
+            with connection.constraint_checks_disabled():
+                for filename, model, columns in IMPORT_SPECS:
+                    total += self.import_file(path / filename, model, columns)
+            connection.check_constraints(
+                table_names=[
+                    model._meta.db_table for _, model, _ in IMPORT_SPECS
+                ]
+            )
+            self.reset_sequences(connection)
+            self.rebuild_aggregates()
+        elapsed = time.monotonic() - started
+
+        bump_cache_version(TITLES_CACHE_PREFIX)
+        bump_cache_version(REVIEWS_CACHE_PREFIX)
+        cache.delete_many([
+            key
+            for user_id in self.updated_user_ids
+            for key in (
+                get_user_cache_key(user_id),
+                get_token_version_cache_key(user_id),
+            )
+        ])
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено строк: {total} за {elapsed:.2f} с '
+            f'({total / elapsed if elapsed else total:.0f} строк/с)'
+        ))
+
+    def import_file(self, file_path, model, columns):
+        started = time.monotonic()
+        count = 0
+        with open(file_path, encoding='utf-8', newline='') as csv_file:
+            reader = csv.DictReader(csv_file)
+            attnames = [
+                columns.get(column, column) for column in reader.fieldnames
+            ]
+            fields = [model._meta.get_field(name) for name in attnames]
+            rows = (
+                self.build_object(model, fields, row.values())
+                for row in reader
+            )
+            with auto_now_disabled(model):
+                while True:
+                    batch = list(islice(rows, self.batch_size))
+                    if not batch:
+                        break
+                    self.upsert(model, batch, fields)
+                    count += len(batch)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'{model._meta.verbose_name_plural}: {count} строк, '
+            f'{count / elapsed if elapsed else count:.0f} строк/с'
+        )
+        return count
+
+    def build_object(self, model, fields, values):
+        data = {}
+        for field, value in zip(fields, values):
+            if value == '' and field.null:
+                value = None
+            data[field.attname] = field.to_python(value)
+        if model is User:
+            data.setdefault('password', self.unusable_password)
+        return model(**data)
+
+    def upsert(self, model, batch, fields):
+        manager = model._default_manager.using(self.using)
+        existing = set(manager.filter(
+            pk__in=[obj.pk for obj in batch],
+        ).values_list('pk', flat=True))
+        manager.bulk_create(obj for obj in batch if obj.pk not in existing)
+        update_fields = [
+            field.name for field in fields if not field.primary_key
+        ]
+        if not existing or not update_fields:
+            return
+        if model is User:
+            changed_access = self.get_changed_access(
+                manager, batch, existing, update_fields
+            )
+        manager.bulk_update(
+            [obj for obj in batch if obj.pk in existing],
+            update_fields,
+        )
+        if model is User:
+            # bulk_update минует User.save, поэтому токены пользователей
+            # со сменившимися правами отзываются здесь же.
+            manager.filter(pk__in=changed_access).update(
+                token_version=F('token_version') + 1
+            )
+            self.updated_user_ids.extend(existing)
+
+    def get_changed_access(self, manager, batch, existing, update_fields):
+        """Первичные ключи пользователей, у которых меняются права."""
+
+        access_fields = [
+            field for field in User.ACCESS_FIELDS if field in update_fields
+        ]
+        if not access_fields:
+            return []
+        stored = {
+            pk: values
+            for pk, *values in manager.filter(pk__in=existing).values_list(
+                'pk', *access_fields
+            )
+        }
+        return [
+            obj.pk for obj in batch
+            if obj.pk in stored and stored[obj.pk] != [
+                getattr(obj, field) for field in access_fields
+            ]
+        ]
+
+    def reset_sequences(self, connection):
+        sequence_sql = connection.ops.sequence_reset_sql(
+            no_style(),
+            [model for _, model, _ in IMPORT_SPECS],
+        )
+        with connection.cursor() as cursor:
+            for sql in sequence_sql:
+                cursor.execute(sql)
+
+    def rebuild_aggregates(self):
+        Title.objects.using(self.using).rebuild_rating()
+        TitleScore.objects.using(self.using).rebuild()
+        TopTitle.objects.using(self.using).rebuild()
+        get_search_backend(self.using).rebuild()
@@ -0,0 +1,19 @@
+import asyncio
+
+from django.utils.decorators import sync_and_async_middleware
+
+from api_yamdb.settings import ASGI_URLCONF
+
+
+@sync_and_async_middleware
+def asgi_urlconf_middleware(get_response):
+    """Подключение асинхронных представлений для запросов через ASGI."""
+
+    if not asyncio.iscoroutinefunction(get_response):
+        return get_response
+
+    async def middleware(request):
+        request.urlconf = ASGI_URLCONF
+        return await get_response(request)
+
+    return middleware
@@ -1,12 +1,39 @@
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import (
+    SAFE_METHODS,
     IsAuthenticatedOrReadOnly,
 )
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
 
+from api_yamdb.settings import RESPONSE_CACHE_TIMEOUT
+from reviews.models import TopTitle
+from .cache import (
+    dump_response,
+    get_cache_version,
+    get_request_digest,
+    get_response_cache_key,
+    load_response,
+)
+from .db_routers import (
+    choose_read_database,
+    is_stale_read,
+    reset_read_database,
+    set_read_database,
+    stick_to_primary,
+)
+from .pagination import TopTitlesPagination
 from .permissions import (
     IsAdminOrReadOnly,
 )
+from .serializers import TopTitleSerializer
 
 
 class CreateListDestroyMixin(
@@ -24,3 +51,231 @@ class CreateListDestroyMixin(
     lookup_field = 'slug'
     filter_backends = (SearchFilter,)
     search_fields = ('name',)
+
+
+class TopTitlesMixin:
+    """Миксин роута '{slug}/top' с лучшими произведениями жанра/категории.
+
+    Произведения читаются из заранее посчитанной таблицы TopTitle
+    одним запросом по составному индексу. Имя связи TopTitle с моделью
+    viewset'а задается атрибутом top_titles_field.
+    """
+
+    top_titles_field = None
+
+    @action(
+        url_path='top',
+        url_name='top',
+        methods=['get'],
+        detail=True,
+        pagination_class=TopTitlesPagination,
+    )
+    def top(self, request, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = TopTitle.objects.filter(**{
+            f'{self.top_titles_field}__{self.lookup_field}':
+                self.kwargs[lookup_url_kwarg],
+        }).select_related('title')
+        page = self.paginate_queryset(queryset)
+        if not page:
+            # Пустая страница: проверяем, что сам жанр/категория есть.
+            get_object_or_404(self.get_queryset(), **{
+                self.lookup_field: self.kwargs[lookup_url_kwarg],
+            })
+        serializer = TopTitleSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class ReplicaReadMixin:
+    """Миксин чтения безопасных запросов из реплики.
+
+    База для чтения выбирается после аутентификации и действует до
+    конца обработки запроса; выбранный алиас доступен в read_database.
+    Успешная запись оставляет чтения пользователя в основной базе
+    на REPLICA_STICKY_TIMEOUT секунд.
+    """
+
+    read_database = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            self.read_database = choose_read_database(request.user)
+            self._read_database_token = set_read_database(
+                self.read_database
+            )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_read_database_token', None)
+        if token is not None:
+            reset_read_database(token)
+            self._read_database_token = None
+        elif (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            stick_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class AnonymousResponseCacheMixin:
+    """Миксин кеширования ответов на анонимные GET-запросы.
+
+    Ключ кеша включает версию, которая меняется при любой записи
+    в связанные модели, поэтому старые ключи просто перестают читаться.
+    Попадание в кеш возвращает готовые байты ответа, минуя ORM,
+    сериализатор и рендер. Ответы из реплики в течение
+    REPLICA_LAG_TIMEOUT секунд после смены версии не кешируются.
+    """
+
+    response_cache_prefix = None
+    response_cache_timeout = RESPONSE_CACHE_TIMEOUT
+
+    def is_response_cacheable(self, request):
+        return (
+            request.method == 'GET'
+            and 'HTTP_AUTHORIZATION' not in request.META
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_response_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+        key = get_response_cache_key(request, self.response_cache_prefix)
+        cached = cache.get(key)
+        if cached is not None:
+            response = load_response(cached)
+            return get_conditional_response(
+                request,
+                etag=response.get('ETag'),
+                response=response,
+            )
+        response = super().dispatch(request, *args, **kwargs)
+        if (
+            response.status_code == 200
+            and not is_stale_read(
+                getattr(self, 'read_database', None),
+                self.response_cache_prefix,
+            )
+            and isinstance(
+                getattr(response, 'accepted_renderer', None),
+                JSONRenderer,
+            )
+        ):
+            response.add_post_render_callback(
+                lambda rendered: cache.set(
+                    key,
+                    dump_response(rendered),
+                    self.response_cache_timeout,
+                )
+            )
+        return response
+
+
+class ConditionalGetMixin:
+    """Миксин условных GET-запросов с ответом 304 Not Modified.
+
+    Валидатором служит только ETag. Если задано поле даты, он считается
+    одним агрегирующим запросом по отфильтрованному queryset: количество
+    строк и максимальная дата публикации. Версия данных из кеша учитывает
+    правки и удаления, которые не меняют дату, поэтому Last-Modified
+    не отдается: по дате публикации клиент получал бы 304 на устаревшие
+    данные. Посчитанное количество строк списка переиспользуется
+    пагинацией вместо COUNT(*). Ответы из реплики в течение
+    REPLICA_LAG_TIMEOUT секунд после смены версии отдаются без ETag.
+    """
+
+    conditional_version_prefix = None
+    conditional_date_field = None
+
+    def get_conditional_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset.order_by()
+
+    def get_conditional_state(self):
+        if not self.conditional_date_field:
+            return {}
+        return self.get_conditional_queryset().aggregate(
+            count=Count('pk'),
+            latest=Max(self.conditional_date_field),
+        )
+
+    def get_pagination_count(self):
+        """Количество строк списка, уже посчитанное для валидаторов."""
+
+        if self.action != 'list':
+            return None
+        return getattr(self, 'conditional_state', {}).get('count')
+
+    def get_etag(self, request):
+        state = self.conditional_state = self.get_conditional_state()
+        return quote_etag(get_request_digest(
+            request,
+            state.get('count'),
+            state.get('latest'),
+            get_cache_version(self.conditional_version_prefix),
+        ))
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        etag = self.get_etag(request)
+        if is_stale_read(
+            getattr(self, 'read_database', None),
+            self.conditional_version_prefix,
+        ):
+            return handler(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, super().list, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, super().retrieve, *args, **kwargs
+        )
+
+
+class ValuesReadMixin:
+    """Миксин чтения через values() без создания экземпляров моделей.
+
+    Включается указанием values_serializer_class во viewset'е.
+    """
+
+    values_serializer_class = None
+
+    def get_values_queryset(self):
+        return self.values_serializer_class.get_values_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.get_values_queryset()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.values_serializer_class(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.values_serializer_class(queryset, many=True)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            self.get_values_queryset(),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        self.check_object_permissions(request, row)
+        return Response(self.values_serializer_class(row).data)
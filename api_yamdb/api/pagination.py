@@ -0,0 +1,192 @@
+from collections import OrderedDict
+
+from django.core.cache import cache
+from rest_framework import pagination, serializers
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from api_yamdb.settings import MAX_TOP_TITLES, PAGINATION_COUNT_CACHE_TIMEOUT
+from .cache import get_request_digest
+
+
+class NoCountLimitOffsetPagination(pagination.LimitOffsetPagination):
+    """Limit/offset без COUNT(*): выбирается limit + 1 строка.
+
+    Вместо общего количества в ответе возвращается признак has_next.
+    """
+
+    display_page_controls = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.request = request
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('has_next', self.has_next),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties'].pop('count')
+        return {
+            'type': 'object',
+            'properties': {
+                'has_next': {'type': 'boolean'},
+                **response_schema['properties'],
+            },
+        }
+
+
+class KnownCountLimitOffsetPagination(pagination.LimitOffsetPagination):
+    """Limit/offset, не повторяющий COUNT(*), если view его уже посчитал.
+
+    Количество берется из метода view get_pagination_count, если он есть
+    и возвращает не None.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        get_pagination_count = getattr(
+            self.view, 'get_pagination_count', None
+        )
+        if get_pagination_count is not None:
+            count = get_pagination_count()
+            if count is not None:
+                return count
+        return self.get_queryset_count(queryset)
+
+    def get_queryset_count(self, queryset):
+        return super().get_count(queryset)
+
+
+class CachedCountLimitOffsetPagination(KnownCountLimitOffsetPagination):
+    """Limit/offset с кешированием COUNT(*) на короткое время.
+
+    Ключ кеша строится по пути и параметрам фильтрации без limit/offset,
+    поэтому все страницы одной выборки используют общий счетчик.
+    """
+
+    count_cache_timeout = PAGINATION_COUNT_CACHE_TIMEOUT
+
+    def get_queryset_count(self, queryset):
+        digest = get_request_digest(
+            self.request,
+            exclude=(self.limit_query_param, self.offset_query_param),
+        )
+        key = f'api:count:{digest}'
+        count = cache.get(key)
+        if count is None:
+            count = super().get_queryset_count(queryset)
+            cache.set(key, count, self.count_cache_timeout)
+        return count
+
+
+class SwitchablePagination(pagination.BasePagination):
+    """Пагинация с выбором режима через параметр запроса.
+
+    По умолчанию используется limit/offset, чтобы не ломать
+    существующих клиентов.
+    """
+
+    mode_query_param = 'pagination'
+    default_mode = 'offset'
+    modes = {
+        'offset': KnownCountLimitOffsetPagination,
+        'nocount': NoCountLimitOffsetPagination,
+        'cachedcount': CachedCountLimitOffsetPagination,
+    }
+    display_page_controls = False
+
+    def get_paginator(self, request):
+        mode = request.query_params.get(
+            self.mode_query_param,
+            self.default_mode,
+        )
+        if mode not in self.modes:
+            raise serializers.ValidationError({
+                self.mode_query_param: [
+                    'Неизвестный режим пагинации. Допустимые значения: '
+                    f'{", ".join(self.modes)}'
+                ]
+            })
+        return self.modes[mode]()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+        page = self.paginator.paginate_queryset(queryset, request, view)
+        self.display_page_controls = self.paginator.display_page_controls
+        return page
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.modes[self.default_mode]().get_paginated_response_schema(
+            schema
+        )
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+
+class TitleCursorPagination(pagination.CursorPagination):
+    """Keyset-пагинация произведений по названию."""
+
+    ordering = ('name', 'id')
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class PubDateCursorPagination(pagination.CursorPagination):
+    """Keyset-пагинация отзывов и комментариев по дате публикации."""
+
+    ordering = ('-pub_date', 'id')
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class TitlePagination(SwitchablePagination):
+    """Пагинация для роута 'titles'."""
+
+    modes = {
+        **SwitchablePagination.modes,
+        'cursor': TitleCursorPagination,
+    }
+
+
+class PubDatePagination(SwitchablePagination):
+    """Пагинация для роутов 'reviews' и 'comments'."""
+
+    modes = {
+        **SwitchablePagination.modes,
+        'cursor': PubDateCursorPagination,
+    }
+
+
+class TopTitlesPagination(NoCountLimitOffsetPagination):
+    """Пагинация рейтингов лучших произведений."""
+
+    max_limit = MAX_TOP_TITLES
@@ -23,7 +23,9 @@ class IsAdminOrReadOnly(permissions.BasePermission):
 
 class IsAuthorModeratorOrAdmin(permissions.BasePermission):
     """Проверка роли пользователя на автора, модератора или
-     администратора, либо только чтение."""
+     администратора, либо только чтение.
+
+     Автор сравнивается по author_id, чтобы не загружать его из БД."""
 
     message = 'Данный запрос недоступен для вас.'
 
@@ -31,7 +33,7 @@ class IsAuthorModeratorOrAdmin(permissions.BasePermission):
         return (
             request.method in permissions.SAFE_METHODS
             or (
-                obj.author == request.user
+                obj.author_id == request.user.pk
                 or request.user.is_admin
                 or request.user.is_moderator
             )
@@ -1,14 +1,25 @@
 from django.contrib.auth.validators import UnicodeUsernameValidator
-from django.core.mail import send_mail
 from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from rest_framework import serializers
-
-from reviews.models import Category, Genre, Title, Review, Comment
+from rest_framework.settings import api_settings
+
+from reviews.models import (
+    Category,
+    Genre,
+    GenreTitle,
+    Title,
+    TopTitle,
+    Review,
+    Comment,
+)
 from api_yamdb.settings import (
     MAX_LENGTH_OF_USERNAME,
     MAX_LENGTH_OF_EMAIL,
 )
 from users.models import User
+from users.outbox import enqueue_email
 from users.validators import validate_username
 
 
@@ -53,32 +64,53 @@ class SignUpSerializer(serializers.ModelSerializer):
     )
 
     def create(self, validated_data):
-        username = validated_data['username']
-        email = validated_data['email']
-
-        user, _ = User.objects.get_or_create(
-            email=email,
-            defaults={'username': username}
-        )
+        # Письмо ставится в очередь в той же транзакции, что и
+        # пользователь; отправляет его команда send_emails.
+        try:
+            with transaction.atomic():
+                return self.register(self.existing_user, validated_data)
+        except IntegrityError:
+            # Пользователь с теми же данными зарегистрировался параллельно.
+            user = self.get_existing_user(validated_data)
+            if user is None:
+                raise
+            with transaction.atomic():
+                return self.register(user, validated_data)
+
+    def register(self, user, validated_data):
+        if user is None:
+            user = User.objects.create(
+                email=validated_data['email'],
+                username=validated_data['username'],
+            )
         confirmation_code = default_token_generator.make_token(user)
-        send_mail(
+        enqueue_email(
             subject='Регистрация на YaMDb',
             message=(
                 f'Здравствуйте, {user.username}. '
                 f'Ваш код подтверждения: {confirmation_code}'
             ),
-            from_email=None,
-            recipient_list=[user.email],
+            recipient=user.email,
         )
         return user
 
-    def validate(self, data):
-        existing_user_with_email = User.objects.filter(
-            email=data.get('email'),
-        ).first()
-        existing_user_with_username = User.objects.filter(
-            username=data.get('username'),
-        ).first()
+    def get_existing_user(self, data):
+        """Поиск пользователя по email и username одним запросом.
+
+        Если email и username принадлежат разным пользователям,
+        возбуждается ошибка валидации.
+        """
+
+        email = data.get('email')
+        username = data.get('username')
+        users = User.objects.filter(Q(email=email) | Q(username=username))
+        existing_user_with_email = None
+        existing_user_with_username = None
+        for user in users[:2]:
+            if user.email == email:
+                existing_user_with_email = user
+            if user.username == username:
+                existing_user_with_username = user
         error_msg = {}
 
         if existing_user_with_email != existing_user_with_username:
@@ -89,6 +121,10 @@ class SignUpSerializer(serializers.ModelSerializer):
                 error_msg['username'] = ['Никнейм уже занят']
 
             raise serializers.ValidationError(error_msg)
+        return existing_user_with_email
+
+    def validate(self, data):
+        self.existing_user = self.get_existing_user(data)
         return data
 
     class Meta:
@@ -155,6 +191,113 @@ class TitleReadSerializer(serializers.ModelSerializer):
         )
 
 
+class TitleValuesListSerializer(serializers.ListSerializer):
+    """Списочный сериалайзер для строк values() с одним запросом жанров."""
+
+    def to_representation(self, data):
+        rows = list(data)
+        genres = self.child.get_genres_map([row['id'] for row in rows])
+        return [self.child.represent(row, genres) for row in rows]
+
+
+class TitleValuesSerializer(serializers.BaseSerializer):
+    """Быстрый сериалайзер для роута 'titles' на чтение.
+
+    Работает со строками values() без создания экземпляров моделей
+    и отдает тот же ответ, что и TitleReadSerializer.
+    """
+
+    values_fields = (
+        'id',
+        'name',
+        'year',
+        'rating',
+        'description',
+        'category__name',
+        'category__slug',
+    )
+
+    class Meta:
+        list_serializer_class = TitleValuesListSerializer
+
+    @classmethod
+    def get_values_queryset(cls, queryset):
+        return queryset.select_related(None).prefetch_related(None).values(
+            *cls.values_fields
+        )
+
+    @staticmethod
+    def get_genres_map(title_ids):
+        genres = {title_id: [] for title_id in title_ids}
+        links = GenreTitle.objects.filter(
+            title_id__in=title_ids,
+        ).order_by('genre__name').values_list(
+            'title_id',
+            'genre__name',
+            'genre__slug',
+        )
+        for title_id, name, slug in links:
+            genres[title_id].append({'name': name, 'slug': slug})
+        return genres
+
+    @staticmethod
+    def represent(row, genres):
+        category = None
+        if row['category__slug'] is not None:
+            category = {
+                'name': row['category__name'],
+                'slug': row['category__slug'],
+            }
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'year': row['year'],
+            'rating': row['rating'],
+            'description': row['description'],
+            'genre': genres[row['id']],
+            'category': category,
+        }
+
+    def to_representation(self, instance):
+        return self.represent(instance, self.get_genres_map([instance['id']]))
+
+
+class ScoreCountSerializer(serializers.Serializer):
+    """Сериалайзер столбца гистограммы оценок."""
+
+    score = serializers.IntegerField()
+    count = serializers.IntegerField()
+
+
+class TitleStatsSerializer(serializers.Serializer):
+    """Сериалайзер для роута 'titles/{id}/stats'."""
+
+    histogram = ScoreCountSerializer(many=True)
+    count = serializers.IntegerField()
+    mean = serializers.FloatField(allow_null=True)
+    median = serializers.FloatField(allow_null=True)
+
+
+class TopTitleSerializer(serializers.ModelSerializer):
+    """Сериалайзер для роутов 'genres/{slug}/top' и 'categories/{slug}/top'."""
+
+    id = serializers.IntegerField(source='title_id')
+    name = serializers.CharField(source='title.name')
+    year = serializers.IntegerField(source='title.year')
+    rating = serializers.IntegerField(source='title.rating')
+
+    class Meta:
+        model = TopTitle
+        fields = (
+            'id',
+            'name',
+            'year',
+            'rating',
+            'score',
+            'review_count',
+        )
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
     """Сериалайзер для роута 'titles' на запись."""
 
@@ -184,6 +327,49 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         )
 
 
+class TitleBulkItemSerializer(serializers.ModelSerializer):
+    """Сериалайзер одного произведения для пакетного создания.
+
+    Категории и жанры ищутся в словарях из контекста, которые заранее
+    загружаются одним запросом на весь пакет.
+    """
+
+    category = serializers.SlugField(required=False, allow_null=True)
+    genre = serializers.ListField(child=serializers.SlugField())
+
+    def _get_by_slug(self, objects_name, slug):
+        obj = self.context[objects_name].get(slug)
+        if obj is None:
+            raise serializers.ValidationError(
+                serializers.SlugRelatedField.default_error_messages[
+                    'does_not_exist'
+                ].format(slug_name='slug', value=slug)
+            )
+        return obj
+
+    def validate_category(self, value):
+        if value is None:
+            return None
+        return self._get_by_slug('categories', value)
+
+    def validate_genre(self, value):
+        # Повтор жанра нарушил бы ограничение unique_genre_title.
+        return [
+            self._get_by_slug('genres', slug)
+            for slug in dict.fromkeys(value)
+        ]
+
+    class Meta:
+        model = Title
+        fields = (
+            'name',
+            'year',
+            'description',
+            'genre',
+            'category',
+        )
+
+
 class ReviewSerializer(serializers.ModelSerializer):
     """Сериалайзер для роута 'reviews'."""
 
@@ -191,19 +377,23 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only=True,
     )
 
-    def validate(self, data):
-        if self.context.get('request').method != 'POST':
-            return data
-        author = self.context.get('request').user
-        title_id = self.context.get('view').kwargs.get('title_id')
-        if Review.objects.filter(
-            author=author,
-            title=title_id,
-        ).exists():
-            raise serializers.ValidationError(
+    def create(self, validated_data):
+        # Повторный отзыв ловится ограничением unique_review: Review.save
+        # выполняется в отдельной транзакции/точке сохранения, поэтому
+        # после IntegrityError соединение остается рабочим.
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                author=validated_data['author'],
+                title=validated_data['title'],
+            ).exists():
+                raise
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [
                 'Отзыв на это произведение уже оставлен'
-            )
-        return data
+            ]
+        })
 
     class Meta:
         model = Review
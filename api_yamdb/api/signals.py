@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.models import User
+from .cache import (
+    REVIEWS_CACHE_PREFIX,
+    TITLES_CACHE_PREFIX,
+    bump_cache_version,
+    get_token_version_cache_key,
+    get_user_cache_key,
+)
+from .sqlite import apply_pragmas
+
+
+def bump_titles_cache_version():
+    bump_cache_version(TITLES_CACHE_PREFIX)
+
+
+def bump_reviews_cache_version():
+    bump_cache_version(REVIEWS_CACHE_PREFIX)
+
+
+def invalidate_titles_cache(sender, **kwargs):
+    """Смена версии кеша произведений при записи связанных моделей."""
+
+    transaction.on_commit(bump_titles_cache_version)
+
+
+for model in (Title, GenreTitle, Category, Genre, Review):
+    post_save.connect(invalidate_titles_cache, sender=model)
+    post_delete.connect(invalidate_titles_cache, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_titles_cache_on_genres(sender, action, **kwargs):
+    """Смена версии кеша произведений при изменении жанров."""
+
+    if action.startswith('post_'):
+        transaction.on_commit(bump_titles_cache_version)
+
+
+def invalidate_reviews_cache(sender, **kwargs):
+    """Смена версии данных отзывов и комментариев при их записи."""
+
+    transaction.on_commit(bump_reviews_cache_version)
+
+
+for model in (Review, Comment):
+    post_save.connect(invalidate_reviews_cache, sender=model)
+    post_delete.connect(invalidate_reviews_cache, sender=model)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Удаление пользователя и версии его токенов из кеша при записи.
+
+    Ключ удаляется сразу и еще раз после фиксации транзакции, чтобы
+    параллельный запрос не закешировал старую роль до коммита.
+    """
+
+    keys = [
+        get_user_cache_key(instance.pk),
+        get_token_version_cache_key(instance.pk),
+    ]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Настройка каждого нового соединения с SQLite."""
+
+    if connection.vendor == 'sqlite':
+        apply_pragmas(connection.connection)
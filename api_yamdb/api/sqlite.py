@@ -0,0 +1,16 @@
+from django.core.exceptions import ImproperlyConfigured
+
+from api_yamdb.settings import SQLITE_PRAGMAS
+
+
+def apply_pragmas(connection, pragmas=SQLITE_PRAGMAS):
+    """Установка PRAGMA на открытом соединении sqlite3.
+
+    journal_mode применяется первым: режим журнала нельзя сменить
+    внутри транзакции, а остальные настройки от него не зависят.
+    """
+
+    for name in sorted(pragmas, key=lambda name: name != 'journal_mode'):
+        if not name.isidentifier():
+            raise ImproperlyConfigured(f'Недопустимое имя PRAGMA: {name!r}.')
+        connection.execute(f'PRAGMA {name} = {pragmas[name]}').fetchall()
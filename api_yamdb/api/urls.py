@@ -10,6 +10,7 @@ from api.views import (
     TitleViewSet,
     ReviewViewSet,
     CommentViewSet,
+    ExportView,
 )
 
 
@@ -63,5 +64,10 @@ auth_urls = [
 
 urlpatterns = [
     path('v1/auth/', include(auth_urls)),
+    path(
+        'v1/export/<str:resource>/',
+        ExportView.as_view(),
+        name='export'
+    ),
     path('v1/', include(router_v1.urls)),
 ]
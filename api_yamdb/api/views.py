@@ -1,5 +1,6 @@
-from django.db.models import Avg
 from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
@@ -12,11 +13,25 @@ from rest_framework.permissions import (
     IsAuthenticatedOrReadOnly,
 )
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
+from api_yamdb.settings import MAX_TITLES_IN_BULK
+from .authentication import get_access_token
+from .cache import (
+    REVIEWS_CACHE_PREFIX,
+    TITLES_CACHE_PREFIX,
+    bump_cache_version,
+)
+from .export import (
+    EXPORT_CONTENT_TYPES,
+    EXPORT_GZIP_CONTENT_TYPE,
+    EXPORT_SPECS,
+    iter_export,
+    spool_export,
+)
 from .filters import TitleFilter
+from .pagination import PubDatePagination, TitlePagination
 from .permissions import (
     IsAdminUser,
     IsAdminOrReadOnly,
@@ -28,6 +43,7 @@ from reviews.models import (
     Title,
     Review,
     Comment,
+    TitleScore,
 )
 from .serializers import (
     UserSerializer,
@@ -36,12 +52,22 @@ from .serializers import (
     ObtainJWTTokenSerializer,
     CategorySerializer,
     GenreSerializer,
+    TitleBulkItemSerializer,
     TitleReadSerializer,
+    TitleStatsSerializer,
+    TitleValuesSerializer,
     TitleWriteSerializer,
     ReviewSerializer,
     CommentSerializer
 )
-from .mixins import CreateListDestroyMixin
+from .mixins import (
+    AnonymousResponseCacheMixin,
+    ConditionalGetMixin,
+    CreateListDestroyMixin,
+    ReplicaReadMixin,
+    TopTitlesMixin,
+    ValuesReadMixin,
+)
 from users.models import User
 
 
@@ -68,12 +94,17 @@ class UserViewSet(ModelViewSet):
         permission_classes=(IsAuthenticated,)
     )
     def user_me_route(self, request):
+        user = request.user
+        # Пользователь из токена с ролью загружен не полностью.
+        deferred_fields = user.get_deferred_fields()
+        if deferred_fields:
+            user.refresh_from_db(fields=deferred_fields)
         if request.method == 'GET':
-            serializer = UserMeSerializer(request.user)
+            serializer = UserMeSerializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         if request.method == "PATCH":
             serializer = UserMeSerializer(
-                request.user, data=request.data, partial=True
+                user, data=request.data, partial=True
             )
             serializer.is_valid(raise_exception=True)
             serializer.save()
@@ -104,7 +135,7 @@ class ObtainJWTTokenViewSet(APIView):
                 serializer.errors,
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        token = AccessToken.for_user(user)
+        token = get_access_token(user)
         return Response(
             {'token': f'{token}'},
             status=status.HTTP_200_OK,
@@ -121,25 +152,84 @@ class SignUpView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class CategoryViewSet(CreateListDestroyMixin):
+class ExportView(APIView):
+    """View-класс для роута 'export/<resource>/'.
+
+    С spool_export выгрузка готовится во временном файле до ответа:
+    так ее отдают асинхронные представления ASGI.
+    """
+
+    permission_classes = (
+        IsAuthenticated,
+        IsAdminUser,
+    )
+    spool_export = False
+
+    def get(self, request, resource):
+        if resource not in EXPORT_SPECS:
+            raise Http404
+        export_format = request.query_params.get('type', 'ndjson')
+        if export_format not in EXPORT_CONTENT_TYPES:
+            return Response(
+                {
+                    'type': [
+                        'Допустимые форматы: '
+                        f'{", ".join(EXPORT_CONTENT_TYPES)}'
+                    ]
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        compress = request.query_params.get('compress') == 'gzip'
+        filename = f'{resource}.{export_format}'
+        content_type = EXPORT_CONTENT_TYPES[export_format]
+        if compress:
+            # Сжатая выгрузка отдается файлом .gz, а не Content-Encoding:
+            # иначе клиент распакует ее и сохранит текст под именем .gz.
+            filename += '.gz'
+            content_type = EXPORT_GZIP_CONTENT_TYPE
+        if self.spool_export:
+            response = FileResponse(
+                spool_export(resource, export_format, compress),
+                content_type=content_type,
+            )
+        else:
+            response = StreamingHttpResponse(
+                iter_export(resource, export_format, compress),
+                content_type=content_type,
+            )
+        response['Content-Disposition'] = f'attachment; filename={filename}'
+        return response
+
+
+class CategoryViewSet(TopTitlesMixin, CreateListDestroyMixin):
     """Viewset для роута 'categories'."""
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    top_titles_field = 'category'
 
 
-class GenreViewSet(CreateListDestroyMixin):
+class GenreViewSet(TopTitlesMixin, CreateListDestroyMixin):
     """Viewset для роута 'genres'."""
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    top_titles_field = 'genre'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ReplicaReadMixin,
+    AnonymousResponseCacheMixin,
+    ConditionalGetMixin,
+    ValuesReadMixin,
+    viewsets.ModelViewSet,
+):
     """Viewset для роута 'titles'."""
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score'),
+    queryset = Title.objects.select_related(
+        'category',
+    ).prefetch_related(
+        'genre',
     ).order_by('name')
     permission_classes = (
         IsAuthenticatedOrReadOnly,
@@ -147,6 +237,10 @@ class TitleViewSet(viewsets.ModelViewSet):
     )
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    pagination_class = TitlePagination
+    response_cache_prefix = TITLES_CACHE_PREFIX
+    conditional_version_prefix = TITLES_CACHE_PREFIX
+    values_serializer_class = TitleValuesSerializer
     http_method_names = (
         'get',
         'post',
@@ -159,8 +253,94 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    @staticmethod
+    def _get_bulk_context(items):
+        items = [item for item in items if isinstance(item, dict)]
+        category_slugs = {
+            item['category'] for item in items
+            if isinstance(item.get('category'), str)
+        }
+        genre_slugs = {
+            slug for item in items
+            if isinstance(item.get('genre'), list)
+            for slug in item['genre'] if isinstance(slug, str)
+        }
+        return {
+            'categories': Category.objects.in_bulk(
+                category_slugs, field_name='slug'
+            ),
+            'genres': Genre.objects.in_bulk(genre_slugs, field_name='slug'),
+        }
+
+    @action(
+        url_path='bulk',
+        url_name='bulk',
+        methods=['post'],
+        detail=False,
+    )
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list) or not (
+            0 < len(items) <= MAX_TITLES_IN_BULK
+        ):
+            return Response(
+                {
+                    'detail': 'Ожидается список от 1 до '
+                    f'{MAX_TITLES_IN_BULK} произведений.'
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        context = self._get_bulk_context(items)
+        titles, genres, errors = [], [], []
+        for index, item in enumerate(items):
+            serializer = TitleBulkItemSerializer(data=item, context=context)
+            if not serializer.is_valid():
+                errors.append({'index': index, 'errors': serializer.errors})
+                continue
+            data = dict(serializer.validated_data)
+            genres.append(data.pop('genre'))
+            titles.append(Title(**data))
+
+        titles = Title.objects.bulk_create_with_genres(titles, genres)
+        if titles:
+            transaction.on_commit(
+                lambda: bump_cache_version(TITLES_CACHE_PREFIX)
+            )
+        created = TitleValuesSerializer.get_values_queryset(
+            Title.objects.filter(
+                pk__in=[title.pk for title in titles],
+            ).order_by('pk')
+        )
+        return Response(
+            {
+                'created': TitleValuesSerializer(created, many=True).data,
+                'errors': errors,
+            },
+            status=(
+                status.HTTP_201_CREATED if titles
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
+
+    @action(
+        url_path='stats',
+        url_name='stats',
+        methods=['get'],
+        detail=True,
+    )
+    def stats(self, request, pk=None):
+        title = get_object_or_404(Title, pk=pk)
+        serializer = TitleStatsSerializer(
+            TitleScore.objects.get_stats(title.pk)
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    viewsets.ModelViewSet,
+):
     """Viewset для роута 'reviews'."""
 
     serializer_class = ReviewSerializer
@@ -168,6 +348,9 @@ class ReviewViewSet(viewsets.ModelViewSet):
         IsAuthenticatedOrReadOnly,
         IsAuthorModeratorOrAdmin,
     )
+    pagination_class = PubDatePagination
+    conditional_version_prefix = REVIEWS_CACHE_PREFIX
+    conditional_date_field = 'pub_date'
     http_method_names = (
         'get',
         'post',
@@ -176,11 +359,19 @@ class ReviewViewSet(viewsets.ModelViewSet):
     )
 
     def _get_title(self):
-        title_id = self.kwargs.get('title_id')
-        return get_object_or_404(
-            Title,
-            id=title_id
-        )
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title,
+                id=self.kwargs.get('title_id'),
+            )
+        return self._title
+
+    def get_conditional_state(self):
+        state = super().get_conditional_state()
+        if not state['count']:
+            # Пустой список отзывов: проверяем, что произведение есть.
+            self._get_title()
+        return state
 
     def perform_create(self, serializer):
         serializer.save(
@@ -189,18 +380,26 @@ class ReviewViewSet(viewsets.ModelViewSet):
         )
 
     def get_queryset(self):
-        return self._get_title().reviews.all()
+        return Review.objects.filter(
+            title_id=self.kwargs.get('title_id'),
+        ).select_related('author')
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    viewsets.ModelViewSet,
+):
     """Viewset для роута 'comments'."""
 
-    queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsAuthorModeratorOrAdmin,
     )
+    pagination_class = PubDatePagination
+    conditional_version_prefix = REVIEWS_CACHE_PREFIX
+    conditional_date_field = 'pub_date'
     http_method_names = (
         'get',
         'post',
@@ -209,13 +408,20 @@ class CommentViewSet(viewsets.ModelViewSet):
     )
 
     def _get_review(self):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        return get_object_or_404(
-            Review,
-            id=review_id,
-            title=title_id,
-        )
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                id=self.kwargs.get('review_id'),
+                title=self.kwargs.get('title_id'),
+            )
+        return self._review
+
+    def get_conditional_state(self):
+        state = super().get_conditional_state()
+        if not state['count']:
+            # Пустой список комментариев: проверяем, что отзыв есть.
+            self._get_review()
+        return state
 
     def perform_create(self, serializer):
         serializer.save(
@@ -224,4 +430,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         )
 
     def get_queryset(self):
-        return self._get_review().comments.all()
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        ).select_related('author')
@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -32,6 +33,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.asgi_urlconf_middleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -61,6 +63,17 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+ASGI_APPLICATION = 'api_yamdb.asgi.application'
+
+# Под ASGI чтение произведений, отзывов и комментариев обслуживают
+# асинхронные представления из этого URLconf.
+ASGI_URLCONF = 'api_yamdb.asgi_urls'
+
+# Потоки для запросов к БД из асинхронных представлений: Django 3.2 не
+# умеет асинхронный ORM, а общий поток sync_to_async обслуживает запросы
+# по одному.
+ASYNC_DB_THREADS = 8
+
 
 # Database
 
@@ -71,6 +84,57 @@ DATABASES = {
     }
 }
 
+# Реплики для чтения: файлы SQLite через запятую в DB_REPLICAS, например
+# DB_REPLICAS=replica1.sqlite3,replica2.sqlite3. В тестах реплики
+# зеркалируют основную базу.
+DATABASE_REPLICAS = []
+for index, name in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1
+):
+    DATABASES[f'replica{index}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / name.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{index}')
+
+DATABASE_ROUTERS = ['api.db_routers.ReplicaRouter']
+
+# Сколько секунд после записи чтения пользователя идут в основную базу.
+REPLICA_STICKY_TIMEOUT = 10
+
+# Сколько секунд после смены данных ответы из реплик не кешируются и не
+# получают ETag: за это время реплики должны догнать основную базу.
+REPLICA_LAG_TIMEOUT = 10
+
+# PRAGMA для каждого нового соединения с SQLite. WAL не блокирует читателей
+# во время записи; пустой словарь оставляет настройки SQLite по умолчанию.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+RESPONSE_CACHE_TIMEOUT = 60
+
+PAGINATION_COUNT_CACHE_TIMEOUT = 30
+
+USER_CACHE_TIMEOUT = 30
+
+TOKEN_VERSION_CACHE_TIMEOUT = 300
+
 
 # Password validation
 
@@ -113,7 +177,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.RoleJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
@@ -124,18 +188,33 @@ SIMPLE_JWT = {
     'AUTH_HEADERS_TYPES': ('Bearer',),
 }
 
+# Выдавать токены с ролью, по которым права проверяются без запроса
+# пользователя к БД.
+JWT_ROLE_CLAIMS = False
+
 AUTH_USER_MODEL = 'users.User'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_POLL_INTERVAL = 5
+
 MAX_LENGTH_OF_USERNAME = 150
 MAX_LENGTH_OF_EMAIL = 254
 MAX_LENGTH_OF_NAME = 256
 MAX_LENGTH_OF_SLUG = 50
 MIN_VALUE_OF_SCORE = 1
 MAX_VALUE_OF_SCORE = 10
+MAX_TITLES_IN_BULK = 1000
+MIN_REVIEWS_FOR_TOP = 3
+MAX_TOP_TITLES = 100
+EXPORT_CHUNK_SIZE = 2000
+# Размер выгрузки в байтах, после которого ASGI пишет ее на диск.
+EXPORT_SPOOL_MAX_SIZE = 10 * 1024 * 1024
 MESSAGE_FOR_MIN_SCORE = f'Оценка меньше {MIN_VALUE_OF_SCORE} запрещена'
 MESSAGE_FOR_MAX_SCORE = f'Оценка больше {MAX_VALUE_OF_SCORE} запрещена'
 MAX_LENGTH_OF_ROLE = 150
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.cache import TITLES_CACHE_PREFIX, bump_cache_version
+from reviews.models import Title, TitleScore, TopTitle
+
+
+class Command(BaseCommand):
+    """Пересчет сохраненного рейтинга произведений по отзывам."""
+
+    help = (
+        'Пересчитывает рейтинг, количество отзывов, распределение '
+        'оценок всех произведений и рейтинги лучших произведений.'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Title.objects.all().rebuild_rating()
+            TitleScore.objects.rebuild()
+            TopTitle.objects.rebuild()
+        # Рейтинг обновлен без сигналов: сбрасываем кеш ответов и ETag.
+        bump_cache_version(TITLES_CACHE_PREFIX)
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитан рейтинг произведений: {updated}')
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """Перестроение полнотекстового индекса произведений."""
+
+    help = 'Перестраивает полнотекстовый индекс произведений.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            get_search_backend().rebuild()
+        self.stdout.write(
+            self.style.SUCCESS('Полнотекстовый индекс перестроен')
+        )
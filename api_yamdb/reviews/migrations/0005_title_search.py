@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from reviews.search import get_search_backend
+
+
+def create_search_index(apps, schema_editor):
+    get_search_backend(schema_editor.connection.alias).create_index(
+        schema_editor
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    get_search_backend(schema_editor.connection.alias).drop_index(
+        schema_editor
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
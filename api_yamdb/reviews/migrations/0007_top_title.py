@@ -0,0 +1,71 @@
+# Generated by Django 3.2 on 2026-10-18 17:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from api_yamdb.settings import MIN_REVIEWS_FOR_TOP
+
+
+def fill_top_titles(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    TopTitle = apps.get_model('reviews', 'TopTitle')
+    titles = Title.objects.filter(review_count__gte=MIN_REVIEWS_FOR_TOP)
+    genres = {}
+    for title_id, genre_id in GenreTitle.objects.filter(
+        title__in=titles,
+    ).values_list('title_id', 'genre_id').iterator():
+        genres.setdefault(title_id, []).append(genre_id)
+    entries = []
+    for title in titles.iterator():
+        values = {
+            'title_id': title.pk,
+            'score': title.rating_sum / title.review_count,
+            'review_count': title.review_count,
+        }
+        if title.category_id is not None:
+            entries.append(TopTitle(category_id=title.category_id, **values))
+        entries.extend(
+            TopTitle(genre_id=genre_id, **values)
+            for genre_id in genres.get(title.pk, ())
+        )
+    TopTitle.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopTitle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Средняя оценка')),
+                ('review_count', models.PositiveIntegerField(verbose_name='Количество отзывов')),
+                ('category', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='top_titles', to='reviews.category', verbose_name='Категория')),
+                ('genre', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='top_titles', to='reviews.genre', verbose_name='Жанр')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='top_entries', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Лучшее произведение',
+                'verbose_name_plural': 'Лучшие произведения',
+                'ordering': ('-score', '-review_count', 'title'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='toptitle',
+            index=models.Index(fields=['genre', '-score', '-review_count', 'title'], name='top_title_genre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='toptitle',
+            index=models.Index(fields=['category', '-score', '-review_count', 'title'], name='top_title_category_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='toptitle',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('category__isnull', True), ('genre__isnull', False)), models.Q(('category__isnull', False), ('genre__isnull', True)), _connector='OR'), name='top_title_genre_or_category'),
+        ),
+        migrations.RunPython(fill_top_titles, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, NullIf
 
 from api_yamdb.settings import (
     MAX_LENGTH_OF_NAME,
@@ -8,6 +10,7 @@ from api_yamdb.settings import (
     MAX_VALUE_OF_SCORE,
     MESSAGE_FOR_MIN_SCORE,
     MESSAGE_FOR_MAX_SCORE,
+    MIN_REVIEWS_FOR_TOP,
 )
 from users.models import User
 from .validators import validate_year
@@ -57,6 +60,82 @@ class Genre(models.Model):
         return self.name
 
 
+class TitleQuerySet(models.QuerySet):
+    """Кастомный QuerySet для произведений."""
+
+    def apply_review_delta(self, score_delta, count_delta):
+        """Сдвиг суммы оценок и числа отзывов одним UPDATE."""
+
+        rating_sum = F('rating_sum') + score_delta
+        review_count = F('review_count') + count_delta
+        return self.update(
+            rating_sum=rating_sum,
+            review_count=review_count,
+            rating=rating_sum / NullIf(review_count, 0),
+        )
+
+    def rebuild_rating(self):
+        """Пересчет рейтинга с нуля по таблице отзывов."""
+
+        reviews = Review.objects.filter(
+            title=OuterRef('pk'),
+        ).order_by().values('title')
+        rating_sum = Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0,
+        )
+        review_count = Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0,
+        )
+        return self.update(
+            rating_sum=rating_sum,
+            review_count=review_count,
+            rating=rating_sum / NullIf(review_count, 0),
+        )
+
+    def bulk_create_with_genres(self, titles, genres):
+        """Пакетное создание произведений и их связей с жанрами.
+
+        genres - список жанров для каждого произведения из titles,
+        повторы жанров отбрасываются.
+        Сигналы post_save при этом не отправляются, поэтому поисковый
+        индекс обновляется здесь же.
+        """
+
+        from .search import get_search_backend
+
+        with transaction.atomic(using=self.db):
+            titles = self._bulk_create_with_pks(titles)
+            GenreTitle.objects.using(self.db).bulk_create(
+                GenreTitle(title=title, genre=genre)
+                for title, title_genres in zip(titles, genres)
+                for genre in dict.fromkeys(title_genres)
+            )
+            get_search_backend(self.db).index_titles(titles)
+        return titles
+
+    def _bulk_create_with_pks(self, titles):
+        connection = connections[self.db]
+        if connection.features.can_return_rows_from_bulk_insert:
+            return self.bulk_create(titles)
+        if connection.vendor != 'sqlite':
+            for title in titles:
+                title.save(using=self.db)
+            return titles
+        # SQLite держит блокировку записи до конца транзакции, а
+        # AUTOINCREMENT выдает идентификаторы по возрастанию, поэтому
+        # последние len(titles) идентификаторов принадлежат этой вставке.
+        self.bulk_create(titles)
+        pks = self.model.objects.using(self.db).order_by(
+            '-pk',
+        ).values_list('pk', flat=True)[:len(titles)]
+        for title, pk in zip(titles, reversed(list(pks))):
+            title.pk = pk
+            title._state.adding = False
+        return titles
+
+
 class Title(models.Model):
     """Модель произведений."""
 
@@ -85,11 +164,38 @@ class Title(models.Model):
         blank=True,
         related_name='titles',
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+        editable=False,
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг произведения',
+        null=True,
+        editable=False,
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = [
+            models.Index(
+                fields=['name', 'id'],
+                name='title_name_idx',
+            ),
+            models.Index(
+                fields=['year'],
+                name='title_year_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -113,6 +219,12 @@ class GenreTitle(models.Model):
         verbose_name = "Произведение - Жанр"
         verbose_name_plural = "Произведения - Жанры"
         ordering = ('title',)
+        constraints = [
+            models.UniqueConstraint(
+                fields=['genre', 'title'],
+                name='unique_genre_title',
+            )
+        ]
 
     def __str__(self):
         return f'{self.genre} - {self.title}'
@@ -165,12 +277,281 @@ class Review(models.Model):
                 name='unique_review',
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date'],
+                name='review_title_pub_date_idx',
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
+    def lock_stored_score(self, using):
+        """Блокировка строки отзыва и оценка, записанная в базе.
+
+        Разница рейтинга считается от нее, а не от оценки, прочитанной
+        при загрузке: иначе параллельные правки вычтут одну и ту же
+        старую оценку.
+        """
+
+        self._loaded_score = type(self)._base_manager.using(
+            using
+        ).select_for_update().filter(pk=self.pk).values_list(
+            'score', flat=True
+        ).first()
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(
+            type(self), instance=self
+        )
+        with transaction.atomic(using=using):
+            if not self._state.adding:
+                self.lock_stored_score(using)
+            super().save(*args, **kwargs)
+
+    def delete(self, using=None, keep_parents=False):
+        using = using or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            self.lock_stored_score(using)
+            if self._loaded_score is None:
+                # Отзыв уже удален параллельным запросом.
+                return 0, {}
+            return super().delete(using, keep_parents)
 
     def __str__(self):
         return (f'Отзыв на {self.title} '
                 f'от автора {self.author}')
 
 
+class TitleScoreQuerySet(models.QuerySet):
+    """Кастомный QuerySet для распределения оценок."""
+
+    def apply_review_delta(self, title_id, score, delta):
+        """Изменение количества отзывов с данной оценкой."""
+
+        updated = self.filter(title_id=title_id, score=score).update(
+            count=F('count') + delta,
+        )
+        if not updated and delta > 0:
+            _, created = self.get_or_create(
+                title_id=title_id,
+                score=score,
+                defaults={'count': delta},
+            )
+            if not created:
+                self.apply_review_delta(title_id, score, delta)
+
+    def get_stats(self, title_id):
+        """Гистограмма, количество, среднее и медиана оценок."""
+
+        counts = dict(
+            self.filter(title_id=title_id).values_list('score', 'count')
+        )
+        histogram = [
+            {'score': score, 'count': counts.get(score, 0)}
+            for score in range(MIN_VALUE_OF_SCORE, MAX_VALUE_OF_SCORE + 1)
+        ]
+        total = sum(bar['count'] for bar in histogram)
+        stats = {
+            'histogram': histogram,
+            'count': total,
+            'mean': None,
+            'median': None,
+        }
+        if not total:
+            return stats
+        stats['mean'] = round(
+            sum(bar['score'] * bar['count'] for bar in histogram) / total,
+            2,
+        )
+        middle = ((total - 1) // 2, total // 2)
+        medians = []
+        seen = 0
+        for bar in histogram:
+            seen += bar['count']
+            medians.extend(
+                bar['score'] for position in middle
+                if seen - bar['count'] <= position < seen
+            )
+        stats['median'] = sum(medians) / len(medians)
+        return stats
+
+    def rebuild(self, title_ids=None):
+        """Пересчет распределения оценок с нуля по таблице отзывов."""
+
+        reviews = Review.objects.all()
+        scores = self.all()
+        if title_ids is not None:
+            reviews = reviews.filter(title_id__in=title_ids)
+            scores = scores.filter(title_id__in=title_ids)
+        scores.delete()
+        rows = reviews.order_by().values('title_id', 'score').annotate(
+            total=Count('pk'),
+        )
+        return self.bulk_create(
+            self.model(
+                title_id=row['title_id'],
+                score=row['score'],
+                count=row['total'],
+            )
+            for row in rows.iterator()
+        )
+
+
+class TitleScore(models.Model):
+    """Модель распределения оценок произведения."""
+
+    title = models.ForeignKey(
+        Title,
+        verbose_name='Произведение',
+        on_delete=models.CASCADE,
+        related_name='scores',
+    )
+    score = models.PositiveSmallIntegerField(
+        verbose_name='Оценка',
+    )
+    count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов с оценкой',
+        default=0,
+    )
+
+    objects = TitleScoreQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+        ordering = ('score',)
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'score'],
+                name='unique_title_score',
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.title}: {self.score} - {self.count}'
+
+
+class TopTitleQuerySet(models.QuerySet):
+    """Кастомный QuerySet для рейтингов лучших произведений."""
+
+    def refresh(self, title_ids):
+        """Пересчет строк рейтингов для указанных произведений."""
+
+        with transaction.atomic(using=self.db):
+            self.filter(title_id__in=title_ids).delete()
+            return self._create_for(
+                Title.objects.using(self.db).filter(pk__in=title_ids)
+            )
+
+    def rebuild(self):
+        """Пересчет рейтингов всех жанров и категорий с нуля."""
+
+        with transaction.atomic(using=self.db):
+            self.all().delete()
+            return self._create_for(Title.objects.using(self.db).all())
+
+    def _create_for(self, titles):
+        titles = titles.filter(
+            review_count__gte=MIN_REVIEWS_FOR_TOP,
+        ).order_by()
+        genres = {}
+        for title_id, genre_id in GenreTitle.objects.using(self.db).filter(
+            title__in=titles,
+        ).order_by().values_list('title_id', 'genre_id').iterator():
+            genres.setdefault(title_id, []).append(genre_id)
+        entries = []
+        for title_id, category_id, rating_sum, review_count in (
+            titles.values_list(
+                'pk', 'category_id', 'rating_sum', 'review_count',
+            ).iterator()
+        ):
+            values = {
+                'title_id': title_id,
+                'score': rating_sum / review_count,
+                'review_count': review_count,
+            }
+            if category_id is not None:
+                entries.append(self.model(category_id=category_id, **values))
+            entries.extend(
+                self.model(genre_id=genre_id, **values)
+                for genre_id in genres.get(title_id, ())
+            )
+        return self.bulk_create(entries)
+
+
+class TopTitle(models.Model):
+    """Модель строки рейтинга лучших произведений жанра или категории.
+
+    Строки хранятся только для произведений, набравших
+    MIN_REVIEWS_FOR_TOP отзывов, и упорядочены индексами так, что
+    чтение рейтинга - это просмотр диапазона индекса. Отдельные
+    индексы по genre и category не нужны: их покрывают составные.
+    """
+
+    genre = models.ForeignKey(
+        Genre,
+        verbose_name='Жанр',
+        on_delete=models.CASCADE,
+        null=True,
+        db_index=False,
+        related_name='top_titles',
+    )
+    category = models.ForeignKey(
+        Category,
+        verbose_name='Категория',
+        on_delete=models.CASCADE,
+        null=True,
+        db_index=False,
+        related_name='top_titles',
+    )
+    title = models.ForeignKey(
+        Title,
+        verbose_name='Произведение',
+        on_delete=models.CASCADE,
+        related_name='top_entries',
+    )
+    score = models.FloatField(
+        verbose_name='Средняя оценка',
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+    )
+
+    objects = TopTitleQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Лучшее произведение'
+        verbose_name_plural = 'Лучшие произведения'
+        ordering = ('-score', '-review_count', 'title')
+        constraints = [
+            models.CheckConstraint(
+                check=(
+                    Q(genre__isnull=False, category__isnull=True)
+                    | Q(genre__isnull=True, category__isnull=False)
+                ),
+                name='top_title_genre_or_category',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['genre', '-score', '-review_count', 'title'],
+                name='top_title_genre_idx',
+            ),
+            models.Index(
+                fields=['category', '-score', '-review_count', 'title'],
+                name='top_title_category_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.genre or self.category}: {self.title} - {self.score}'
+
+
 class Comment(models.Model):
     """Модель комментариев."""
 
@@ -198,6 +579,12 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date'],
+                name='comment_review_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text
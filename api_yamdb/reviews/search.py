@@ -0,0 +1,173 @@
+import re
+
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = 'reviews_title_fts'
+SEARCH_CONFIG = 'russian'
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class BaseTitleSearchBackend:
+    """Базовый бэкенд полнотекстового поиска по произведениям."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def create_index(self, schema_editor):
+        """Создание полнотекстового индекса в миграции."""
+
+    def drop_index(self, schema_editor):
+        """Удаление полнотекстового индекса в миграции."""
+
+    def index_titles(self, titles):
+        """Добавление или обновление произведений в индексе."""
+
+    def remove_titles(self, title_ids):
+        """Удаление произведений из индекса."""
+
+    def rebuild(self):
+        """Полное перестроение индекса."""
+
+    def search(self, queryset, query):
+        """Запасной вариант без индекса: поиск подстроки."""
+
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        )
+
+
+class SQLiteTitleSearchBackend(BaseTitleSearchBackend):
+    """Поиск через виртуальную таблицу FTS5.
+
+    Токенизатор unicode61 приводит к нижнему регистру и кириллицу,
+    а remove_diacritics склеивает «ё» с «е». Каждое слово запроса ищется
+    как префикс, что частично компенсирует русские окончания.
+    """
+
+    def create_index(self, schema_editor):
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} '
+            'USING fts5(name, description, '
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, name, description) '
+            "SELECT id, name, COALESCE(description, '') FROM reviews_title"
+        )
+
+    def drop_index(self, schema_editor):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+    def index_titles(self, titles):
+        rows = [
+            (title.pk, title.name, title.description or '')
+            for title in titles
+        ]
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+                [(row[0],) for row in rows],
+            )
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, name, description) '
+                'VALUES (%s, %s, %s)',
+                rows,
+            )
+
+    def remove_titles(self, title_ids):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+                [(title_id,) for title_id in title_ids],
+            )
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, name, description) '
+                "SELECT id, name, COALESCE(description, '') FROM reviews_title"
+            )
+
+    @staticmethod
+    def build_match(query):
+        return ' '.join(
+            '"{}"*'.format(word) for word in WORD_PATTERN.findall(query)
+        )
+
+    def search(self, queryset, query):
+        match = self.build_match(query)
+        if not match:
+            return queryset.none()
+        table = queryset.model._meta.db_table
+        return queryset.filter(
+            id__in=RawSQL(
+                f'SELECT rowid FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s',
+                (match,),
+            ),
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT rank FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s '
+                f'AND rowid = "{table}"."id"',
+                (match,),
+            ),
+        ).order_by('search_rank', 'name', 'id')
+
+
+class PostgreSQLTitleSearchBackend(BaseTitleSearchBackend):
+    """Поиск через tsvector с GIN-индексом по выражению.
+
+    Выражение индекса совпадает с тем, что строит SearchVector,
+    поэтому индекс обновляется самой СУБД при записи произведений.
+    """
+
+    index_name = 'reviews_title_search_idx'
+
+    def create_index(self, schema_editor):
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {self.index_name} '
+            'ON reviews_title USING GIN (to_tsvector('
+            f"'{SEARCH_CONFIG}'::regconfig, "
+            "COALESCE((name)::text, '') || ' ' || "
+            "COALESCE((description)::text, '')))"
+        )
+
+    def drop_index(self, schema_editor):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {self.index_name}')
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+        )
+
+        vector = SearchVector('name', 'description', config=SEARCH_CONFIG)
+        search_query = SearchQuery(query, config=SEARCH_CONFIG)
+        return queryset.annotate(
+            search_vector=vector,
+            search_rank=SearchRank(vector, search_query),
+        ).filter(
+            search_vector=search_query,
+        ).order_by(F('search_rank').desc(), 'name', 'id')
+
+
+SEARCH_BACKENDS = {
+    'sqlite': SQLiteTitleSearchBackend,
+    'postgresql': PostgreSQLTitleSearchBackend,
+}
+
+
+def get_search_backend(using='default'):
+    """Бэкенд поиска для используемой СУБД."""
+
+    connection = connections[using]
+    return SEARCH_BACKENDS.get(connection.vendor, BaseTitleSearchBackend)(
+        connection
+    )
@@ -0,0 +1,95 @@
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Review, Title, TitleScore, TopTitle
+from .search import get_search_backend
+
+
+def refresh_top_titles(title_ids, using=DEFAULT_DB_ALIAS):
+    """Пересчет рейтингов лучших произведений после фиксации транзакции.
+
+    Откладывание нужно при каскадном удалении произведения: его отзывы
+    удаляются раньше него самого, и строки рейтинга не должны
+    появиться снова.
+    """
+
+    title_ids = list(title_ids)
+    transaction.on_commit(
+        lambda: TopTitle.objects.using(using).refresh(title_ids),
+        using=using,
+    )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, update_fields,
+                                 **kwargs):
+    """Обновление рейтинга произведения при создании и изменении отзыва."""
+
+    if update_fields is not None and 'score' not in update_fields:
+        return
+    titles = Title.objects.filter(pk=instance.title_id)
+    loaded_score = getattr(instance, '_loaded_score', None)
+    if created:
+        titles.apply_review_delta(instance.score, 1)
+        TitleScore.objects.apply_review_delta(
+            instance.title_id, instance.score, 1
+        )
+    elif loaded_score is None:
+        titles.rebuild_rating()
+        TitleScore.objects.rebuild(title_ids=[instance.title_id])
+    elif instance.score != loaded_score:
+        titles.apply_review_delta(instance.score - loaded_score, 0)
+        TitleScore.objects.apply_review_delta(
+            instance.title_id, loaded_score, -1
+        )
+        TitleScore.objects.apply_review_delta(
+            instance.title_id, instance.score, 1
+        )
+    else:
+        return
+    instance._loaded_score = instance.score
+    refresh_top_titles([instance.title_id])
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    """Обновление рейтинга произведения при удалении отзыва."""
+
+    score = getattr(instance, '_loaded_score', None)
+    if score is None:
+        score = instance.score
+    Title.objects.filter(pk=instance.title_id).apply_review_delta(-score, -1)
+    TitleScore.objects.apply_review_delta(instance.title_id, score, -1)
+    refresh_top_titles([instance.title_id])
+
+
+@receiver(post_save, sender=Title)
+def index_title_on_save(sender, instance, created, using, **kwargs):
+    """Обновление полнотекстового индекса при записи произведения."""
+
+    get_search_backend(using).index_titles([instance])
+    if not created:
+        refresh_top_titles([instance.pk], using)
+
+
+@receiver(post_delete, sender=Title)
+def remove_title_from_index(sender, instance, using, **kwargs):
+    """Удаление произведения из полнотекстового индекса."""
+
+    get_search_backend(using).remove_titles([instance.pk])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def refresh_top_titles_on_genres(sender, instance, action, reverse, pk_set,
+                                 using, **kwargs):
+    """Пересчет рейтингов лучших произведений при изменении жанров."""
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        refresh_top_titles([instance.pk], using)
+    elif pk_set is None:
+        TopTitle.objects.using(using).filter(genre=instance).delete()
+    else:
+        refresh_top_titles(pk_set, using)
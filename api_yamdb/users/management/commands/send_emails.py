@@ -0,0 +1,71 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from api_yamdb.settings import (
+    EMAIL_OUTBOX_BATCH_SIZE,
+    EMAIL_OUTBOX_POLL_INTERVAL,
+)
+from users.outbox import deliver_batch
+
+
+class Command(BaseCommand):
+    """Обработчик очереди писем."""
+
+    help = (
+        'Отправляет письма из очереди пачками через одно соединение с '
+        'почтовым бэкендом. Неудачные попытки повторяются с '
+        'экспоненциальной задержкой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EMAIL_OUTBOX_BATCH_SIZE,
+            help='Количество писем в одной пачке.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а ждать новых писем.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=EMAIL_OUTBOX_POLL_INTERVAL,
+            help='Пауза в секундах между проверками пустой очереди.',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='База данных с очередью писем.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('Размер пакета должен быть положительным.')
+        total_sent = total_failed = 0
+        with get_connection() as connection:
+            while True:
+                sent, failed = deliver_batch(
+                    connection, batch_size, options['database']
+                )
+                total_sent += sent
+                total_failed += failed
+                if sent + failed == batch_size:
+                    continue
+                if not options['loop']:
+                    break
+                # Простаивающее соединение закрываем, чтобы почтовый
+                # сервер не оборвал его по таймауту; следующая пачка
+                # откроет его заново.
+                connection.close()
+                time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено писем: {total_sent}, неудачных попыток: '
+            f'{total_failed}'
+        ))
@@ -1,9 +1,16 @@
+from datetime import timedelta
+
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.mail import EmailMessage
 from django.db import models
+from django.utils import timezone
 
 from users.validators import validate_username
 from api_yamdb.settings import (
+    EMAIL_OUTBOX_MAX_ATTEMPTS,
+    EMAIL_OUTBOX_RETRY_DELAY,
+    MAX_LENGTH_OF_EMAIL,
     MAX_LENGTH_OF_USERNAME,
     MAX_LENGTH_OF_ROLE,
     MESSAGE_FOR_USERNAME_VALIDATOR,
@@ -51,6 +58,16 @@ class User(AbstractUser):
         max_length=MAX_LENGTH_OF_ROLE,
     )
 
+    token_version = models.PositiveIntegerField(
+        verbose_name='Версия токенов доступа',
+        default=0,
+        editable=False,
+    )
+
+    # Поля, от которых зависят права; их изменение отзывает токены
+    # с ролью, выданные раньше.
+    ACCESS_FIELDS = ('role', 'is_superuser', 'is_active')
+
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
@@ -62,6 +79,41 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_access = instance._get_access_state()
+        return instance
+
+    def _get_access_state(self):
+        return tuple(self.__dict__.get(field) for field in self.ACCESS_FIELDS)
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using, fields)
+        loaded_access = dict(zip(
+            self.ACCESS_FIELDS,
+            getattr(self, '_loaded_access', self._get_access_state()),
+        ))
+        for field in self.ACCESS_FIELDS:
+            if fields is None or field in fields:
+                loaded_access[field] = self.__dict__.get(field)
+        self._loaded_access = tuple(
+            loaded_access[field] for field in self.ACCESS_FIELDS
+        )
+
+    def save(self, *args, **kwargs):
+        loaded_access = getattr(self, '_loaded_access', None)
+        if (
+            loaded_access is not None
+            and loaded_access != self._get_access_state()
+        ):
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._loaded_access = self._get_access_state()
+
     @property
     def is_moderator(self):
         return self.role == self.MODERATOR
@@ -69,3 +121,108 @@ class User(AbstractUser):
     @property
     def is_admin(self):
         return self.role == self.ADMIN or self.is_superuser
+
+
+class OutboxEmailQuerySet(models.QuerySet):
+    """Кастомный QuerySet для очереди писем."""
+
+    def due(self):
+        """Неотправленные письма, время отправки которых наступило."""
+
+        return self.filter(
+            status=OutboxEmail.PENDING,
+            next_attempt_at__lte=timezone.now(),
+        ).order_by('next_attempt_at', 'pk')
+
+
+class OutboxEmail(models.Model):
+    """Модель письма в очереди на отправку."""
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Ожидает отправки'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    ]
+
+    subject = models.CharField(
+        verbose_name='Тема',
+        max_length=255,
+    )
+    message = models.TextField(
+        verbose_name='Текст письма',
+    )
+    from_email = models.EmailField(
+        verbose_name='Отправитель',
+        max_length=MAX_LENGTH_OF_EMAIL,
+        null=True,
+    )
+    recipient = models.EmailField(
+        verbose_name='Получатель',
+        max_length=MAX_LENGTH_OF_EMAIL,
+    )
+    status = models.CharField(
+        verbose_name='Статус',
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        max_length=16,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Количество попыток',
+        default=0,
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Время следующей попытки',
+        default=timezone.now,
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True,
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+    )
+
+    objects = OutboxEmailQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('-created_at',)
+        indexes = [
+            models.Index(
+                fields=['status', 'next_attempt_at'],
+                name='outbox_email_due_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+    def as_message(self, connection=None):
+        return EmailMessage(
+            subject=self.subject,
+            body=self.message,
+            from_email=self.from_email,
+            to=[self.recipient],
+            connection=connection,
+        )
+
+    def register_failure(self, error):
+        """Учет неудачной попытки с экспоненциальной задержкой."""
+
+        self.attempts += 1
+        self.last_error = repr(error)
+        if self.attempts >= EMAIL_OUTBOX_MAX_ATTEMPTS:
+            self.status = self.FAILED
+            return
+        self.next_attempt_at = timezone.now() + timedelta(
+            seconds=EMAIL_OUTBOX_RETRY_DELAY * 2 ** (self.attempts - 1)
+        )
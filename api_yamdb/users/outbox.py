@@ -0,0 +1,71 @@
+from django.core.mail import get_connection
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from api_yamdb.settings import EMAIL_OUTBOX_BATCH_SIZE
+from .models import OutboxEmail
+
+
+def enqueue_email(subject, message, recipient, from_email=None):
+    """Постановка письма в очередь вместо отправки во время запроса."""
+
+    return OutboxEmail.objects.create(
+        subject=subject,
+        message=message,
+        recipient=recipient,
+        from_email=from_email,
+    )
+
+
+def _open(connection):
+    """Открытие соединения с бэкендом, если оно еще не открыто.
+
+    Ошибку открытия не поднимаем: ее получит и запишет в письмо
+    попытка отправки.
+    """
+
+    try:
+        connection.open()
+    except Exception:
+        pass
+
+
+def deliver_batch(connection=None, batch_size=EMAIL_OUTBOX_BATCH_SIZE,
+                  using=DEFAULT_DB_ALIAS):
+    """Отправка пачки писем из очереди через одно соединение с бэкендом.
+
+    Возвращает количество отправленных и неудачных писем. Там, где
+    база поддерживает SKIP LOCKED, несколько обработчиков не возьмут
+    одно и то же письмо.
+    """
+
+    if connection is None:
+        connection = get_connection()
+    # Закрытое соединение бэкенд SMTP открывал бы заново на каждое письмо.
+    _open(connection)
+    with transaction.atomic(using=using):
+        emails = OutboxEmail.objects.using(using).due()
+        if connections[using].features.has_select_for_update_skip_locked:
+            emails = emails.select_for_update(skip_locked=True)
+        sent, failed = [], []
+        for email in emails[:batch_size]:
+            try:
+                connection.send_messages([email.as_message(connection)])
+            except Exception as error:
+                email.register_failure(error)
+                failed.append(email)
+                # Соединение могло оборваться: переоткрываем его для
+                # остальных писем пачки.
+                connection.close()
+                _open(connection)
+            else:
+                sent.append(email.pk)
+        OutboxEmail.objects.using(using).filter(pk__in=sent).update(
+            status=OutboxEmail.SENT,
+            sent_at=timezone.now(),
+        )
+        OutboxEmail.objects.using(using).bulk_update(
+            failed,
+            ['attempts', 'status', 'next_attempt_at', 'last_error'],
+        )
+    return len(sent), len(failed)
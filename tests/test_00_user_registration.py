@@ -2,6 +2,7 @@ from http import HTTPStatus
 
 import pytest
 from django.core import mail
+from django.core.management import call_command
 from django.db.utils import IntegrityError
 
 from tests.utils import (
@@ -112,6 +113,8 @@ class Test00UserRegistration:
         }
 
         response = client.post(self.URL_SIGNUP, data=valid_data)
+        # письма из очереди отправляет отдельный обработчик
+        call_command('send_emails')
         outbox_after = mail.outbox  # email outbox after user create
 
         assert response.status_code != HTTPStatus.NOT_FOUND, (
@@ -161,6 +164,7 @@ class Test00UserRegistration:
         response = admin_client.post(
             self.URL_ADMIN_CREATE_USER, data=valid_data
         )
+        call_command('send_emails')
         outbox_after = mail.outbox
 
         assert response.status_code != HTTPStatus.NOT_FOUND, (
@@ -375,3 +379,36 @@ class Test00UserRegistration:
             'пользователя, созданного администратором,  возвращает ответ '
             'со статусом 200.'
         )
+
+    def test_signup_query_count(self, client, django_user_model,
+                                django_assert_num_queries):
+        valid_data = {
+            'email': 'query_count@yamdb.fake',
+            'username': 'query_count'
+        }
+        # Было 8 запросов: два .first() в validate, get_or_create с
+        # точкой сохранения и письмо. Стало: один поиск по
+        # Q(email) | Q(username), BEGIN, пользователь и письмо.
+        with django_assert_num_queries(4):
+            response = client.post(self.URL_SIGNUP, data=valid_data)
+        assert response.status_code == HTTPStatus.OK
+
+        # Было 5 запросов, стало: поиск, BEGIN и письмо.
+        with django_assert_num_queries(3):
+            response = client.post(self.URL_SIGNUP, data=valid_data)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что повторный POST-запрос к `{self.URL_SIGNUP}` '
+            'с данными существующего пользователя возвращает ответ со '
+            'статусом 200.'
+        )
+
+        with django_assert_num_queries(1):
+            response = client.post(self.URL_SIGNUP, data={
+                'email': valid_data['email'],
+                'username': 'another_username'
+            })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {'email': ['Эл. почта уже занята']}
+        assert django_user_model.objects.filter(
+            email=valid_data['email']
+        ).count() == 1
@@ -353,3 +353,33 @@ class Test04TitleAPI:
             f'Проверьте, что PUT-запрос к `{self.TITLES_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_07_titles_constant_query_count(self, client, admin_client,
+                                            django_assert_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        # count + titles with category join + one genre prefetch
+        expected_queries = 3
+        with django_assert_num_queries(expected_queries):
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+
+        for idx in range(5):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [genres[0]['slug'], genres[2]['slug']],
+                'category': categories[idx % 2]['slug'],
+            })
+        with django_assert_num_queries(expected_queries):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == len(titles) + 5, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` возвращает '
+            'все созданные произведения.'
+        )
+
+        with django_assert_num_queries(2):
+            client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                )
+            )
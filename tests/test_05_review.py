@@ -3,6 +3,7 @@ from http import HTTPStatus
 import pytest
 from django.db.utils import IntegrityError
 
+from reviews.models import Review
 from tests.utils import (
     check_fields, check_pagination, create_reviews, create_single_review,
     create_titles
@@ -413,3 +414,78 @@ class Test05ReviewAPI:
             f'Проверьте, что PUT-запрос к `{self.REVIEW_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_07_reviews_constant_query_count(self, client, admin_client,
+                                             django_user_model,
+                                             django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        # агрегат для ETag (он же count) + страница отзывов с авторами,
+        # для пустого списка - проверка существования произведения
+        expected_queries = 2
+        with django_assert_num_queries(expected_queries):
+            response = client.get(url)
+        assert response.json()['count'] == 0
+
+        for idx in range(12):
+            author = django_user_model.objects.create_user(
+                username=f'reviewer{idx}', email=f'reviewer{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title_id=titles[0]['id'], author=author,
+                text=f'Отзыв {idx}', score=idx % 10 + 1,
+            )
+        with django_assert_num_queries(expected_queries):
+            response = client.get(url)
+        data = response.json()
+        assert data['count'] == 12 and len(data['results']) == 10, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает страницу '
+            'отзывов и их общее количество.'
+        )
+        assert data['results'][0]['author'] == 'reviewer11'
+
+        with django_assert_num_queries(expected_queries):
+            client.get(url, {'pagination': 'nocount'})
+        with django_assert_num_queries(expected_queries):
+            client.get(
+                self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id'],
+                    review_id=data['results'][0]['id'],
+                )
+            )
+        assert client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=999)
+        ).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что для несуществующего произведения возвращается '
+            'ответ со статусом 404.'
+        )
+
+    def test_08_duplicate_review_without_precheck(
+            self, admin_client, user_client, django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'Первый отзыв', 'score': 7}
+        with django_assert_max_num_queries(20) as captured:
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert not [
+            query['sql'] for query in captured.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_review"' in query['sql']
+        ], (
+            'Проверьте, что перед созданием отзыва не выполняется запрос '
+            'на проверку повторного отзыва: ее выполняет ограничение '
+            '`unique_review`.'
+        )
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': ['Отзыв на это произведение уже оставлен']
+        }, (
+            'Проверьте, что при повторном отзыве возвращается прежнее '
+            'сообщение об ошибке.'
+        )
+        assert Review.objects.filter(title_id=titles[0]['id']).count() == 1
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
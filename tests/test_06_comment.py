@@ -2,6 +2,7 @@ from http import HTTPStatus
 
 import pytest
 
+from reviews.models import Comment
 from tests.utils import (check_fields, check_pagination, create_comments,
                          create_reviews, create_single_comment)
 
@@ -366,3 +367,69 @@ class Test06CommentAPI:
             f'Проверьте, что PUT-запрос к `{self.COMMENT_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_08_comments_constant_query_count(self, client, admin_client,
+                                              admin, user_client, user,
+                                              django_user_model,
+                                              django_assert_num_queries):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        # агрегат для ETag (он же count) + страница комментариев с
+        # авторами, для пустого списка - проверка пары отзыв/произведение
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.json()['count'] == 0
+
+        for idx in range(12):
+            author = django_user_model.objects.create_user(
+                username=f'commenter{idx}', email=f'commenter{idx}@yamdb.fake'
+            )
+            Comment.objects.create(
+                review_id=reviews[0]['id'], author=author,
+                text=f'Комментарий {idx}',
+            )
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        data = response.json()
+        assert data['count'] == 12 and len(data['results']) == 10, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает страницу '
+            'комментариев и их общее количество.'
+        )
+        assert data['results'][0]['author'] == 'commenter11'
+
+        detail_url = self.COMMENT_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'],
+            review_id=reviews[0]['id'],
+            comment_id=data['results'][0]['id'],
+        )
+        with django_assert_num_queries(2):
+            client.get(detail_url)
+
+        # проверка отзыва + вставка, пользователь из токена уже в кеше
+        with django_assert_num_queries(2):
+            response = user_client.post(url, data={'text': 'Новый'})
+        assert response.status_code == HTTPStatus.CREATED
+
+        detail_url = self.COMMENT_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'],
+            review_id=reviews[0]['id'],
+            comment_id=response.json()['id'],
+        )
+        # комментарий с автором + обновление
+        with django_assert_num_queries(2):
+            response = user_client.patch(detail_url, data={'text': 'Правка'})
+        assert response.status_code == HTTPStatus.OK
+
+        wrong_title_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=reviews[0]['id']
+        )
+        assert client.get(wrong_title_url).status_code == (
+            HTTPStatus.NOT_FOUND
+        ), (
+            'Проверьте, что для отзыва другого произведения возвращается '
+            'ответ со статусом 404.'
+        )
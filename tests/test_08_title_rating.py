@@ -0,0 +1,133 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title, TitleScore
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def test_01_rating_follows_reviews(self, admin_client, user_client,
+                                       moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+
+        create_single_review(user_client, title_id, 'Хорошо', 8)
+        response = create_single_review(
+            moderator_client, title_id, 'Так себе', 5
+        )
+        review_id = response.json()['id']
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.review_count, title.rating) == (
+            13, 2, 6
+        ), (
+            'Проверьте, что при создании отзыва обновляются сумма оценок, '
+            'количество отзывов и рейтинг произведения.'
+        )
+        assert admin_client.get(url).json().get('rating') == 6
+
+        response = moderator_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            ),
+            data={'score': 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert admin_client.get(url).json().get('rating') == 9, (
+            'Проверьте, что при изменении оценки отзыва пересчитывается '
+            'рейтинг произведения.'
+        )
+
+        response = moderator_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.review_count, title.rating) == (
+            8, 1, 8
+        ), (
+            'Проверьте, что при удалении отзыва обновляются сумма оценок, '
+            'количество отзывов и рейтинг произведения.'
+        )
+
+    def test_02_rating_reset_without_reviews(self, admin_client, user_client,
+                                             user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Отлично', 10)
+        user.delete()
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.review_count, title.rating) == (
+            0, 0, None
+        ), (
+            'Проверьте, что после удаления всех отзывов рейтинг '
+            'произведения равен `None`.'
+        )
+
+    def test_03_rebuild_ratings_command(self, client, admin_client,
+                                        user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Неплохо', 7)
+        Title.objects.update(rating_sum=0, review_count=0, rating=None)
+        title_url = f'/api/v1/titles/{title_id}/'
+        assert client.get(title_url).json()['rating'] is None
+
+        call_command('rebuild_ratings')
+
+        assert client.get(title_url).json()['rating'] == 7, (
+            'Проверьте, что после команды `rebuild_ratings` кеш ответов '
+            'произведений сбрасывается.'
+        )
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.review_count, title.rating) == (
+            7, 1, 7
+        ), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'рейтинг произведений по отзывам.'
+        )
+        other = Title.objects.get(pk=titles[1]['id'])
+        assert (other.review_count, other.rating) == (0, None)
+
+    def test_04_concurrent_review_updates(self, admin_client, user_client,
+                                          moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Хорошо', 5)
+        create_single_review(moderator_client, title_id, 'Плохо', 1)
+        # Два запроса загрузили один и тот же отзыв до записи.
+        first, second = (
+            Review.objects.get(title_id=title_id, score=5) for _ in range(2)
+        )
+        first.score = 8
+        first.save()
+        second.score = 2
+        second.save()
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.review_count) == (3, 2), (
+            'Проверьте, что рейтинг произведения считается от оценки '
+            'в базе, а не от оценки, загруженной до параллельной правки.'
+        )
+        assert dict(TitleScore.objects.filter(
+            title_id=title_id, count__gt=0
+        ).values_list('score', 'count')) == {1: 1, 2: 1}
+
+        first.delete()
+        second.delete()
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.review_count) == (1, 1), (
+            'Проверьте, что повторное удаление отзыва не меняет рейтинг '
+            'произведения.'
+        )
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09Pagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_titles_cursor_pagination(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        for idx in range(3):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'],
+            })
+        expected_names = sorted(
+            [title['name'] for title in titles]
+            + [f'Произведение {idx}' for idx in range(3)]
+        )
+
+        response = client.get(f'{self.TITLES_URL}?pagination=cursor&limit=2')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert set(data) == {'next', 'previous', 'results'}, (
+            f'Проверьте, что в режиме `pagination=cursor` ответ на GET-запрос '
+            f'к `{self.TITLES_URL}` содержит ключи `next`, `previous` и '
+            '`results` без `count`.'
+        )
+        names = [title['name'] for title in data['results']]
+        while data['next']:
+            data = client.get(data['next']).json()
+            names.extend(title['name'] for title in data['results'])
+        assert names == expected_names, (
+            'Проверьте, что курсорная пагинация произведений обходит все '
+            'произведения в порядке названия.'
+        )
+        assert data['previous'], (
+            'Проверьте, что курсорная пагинация возвращает ссылку на '
+            'предыдущую страницу.'
+        )
+
+    def test_02_reviews_cursor_pagination(self, client, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(f'{url}?pagination=cursor')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [review['id'] for review in data['results']] == [
+            review['id'] for review in reviews
+        ]
+        assert data['next'] is None
+
+    def test_03_default_and_unknown_modes(self, client, admin_client):
+        create_titles(admin_client)
+        data = client.get(self.TITLES_URL).json()
+        assert data['count'] == 2, (
+            'Проверьте, что по умолчанию для эндпоинта '
+            f'`{self.TITLES_URL}` используется пагинация limit/offset.'
+        )
+        response = client.get(f'{self.TITLES_URL}?pagination=unknown')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что при неизвестном режиме пагинации возвращается '
+            'ответ со статусом 400.'
+        )
+
+    def test_04_nocount_pagination(self, client, admin_client,
+                                   django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?pagination=nocount&limit=1'
+        # строки страницы + жанры, без COUNT(*)
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        data = response.json()
+        assert 'count' not in data and data['has_next'] is True, (
+            'Проверьте, что в режиме `pagination=nocount` ответ содержит '
+            '`has_next` и не содержит `count`.'
+        )
+        assert data['results'][0]['name'] == sorted(
+            title['name'] for title in titles
+        )[0]
+        data = client.get(data['next']).json()
+        assert data['has_next'] is False and data['next'] is None
+        assert data['previous'], (
+            'Проверьте, что в режиме `pagination=nocount` возвращается '
+            'ссылка на предыдущую страницу.'
+        )
+
+    def test_05_cachedcount_pagination(self, client, admin_client,
+                                       django_assert_num_queries):
+        create_titles(admin_client)
+        url = f'{self.TITLES_URL}?pagination=cachedcount'
+        assert client.get(f'{url}&limit=1').json()['count'] == 2
+        # счетчик общий для всех страниц одной выборки
+        with django_assert_num_queries(2):
+            response = client.get(f'{url}&limit=1&offset=1')
+        assert response.json()['count'] == 2, (
+            'Проверьте, что в режиме `pagination=cachedcount` количество '
+            'объектов берется из кеша.'
+        )
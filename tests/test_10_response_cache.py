@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_cache_hit_skips_database(self, client, admin_client,
+                                         django_assert_num_queries):
+        titles, _, genres = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?genre={genres[0]["slug"]}'
+        first = client.get(url)
+        assert first.status_code == HTTPStatus.OK
+
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second.status_code == HTTPStatus.OK
+        assert second.content == first.content, (
+            'Проверьте, что ответ из кеша совпадает с исходным ответом.'
+        )
+        assert second['Content-Type'] == first['Content-Type']
+
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        client.get(detail_url)
+        with django_assert_num_queries(0):
+            client.get(detail_url)
+
+    def test_02_writes_invalidate_cache(self, client, admin_client,
+                                        user_client):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        assert client.get(detail_url).json()['rating'] is None
+
+        create_single_review(user_client, titles[0]['id'], 'Супер', 9)
+        assert client.get(detail_url).json()['rating'] == 9, (
+            'Проверьте, что создание отзыва сбрасывает кеш произведений.'
+        )
+
+        admin_client.patch(detail_url, data={'name': 'Новое название'})
+        assert client.get(detail_url).json()['name'] == 'Новое название', (
+            'Проверьте, что изменение произведения сбрасывает кеш.'
+        )
+
+        admin_client.patch(detail_url, data={'genre': ['drama']})
+        genres = client.get(detail_url).json()['genre']
+        assert [genre['slug'] for genre in genres] == ['drama'], (
+            'Проверьте, что изменение жанров произведения сбрасывает кеш.'
+        )
+
+    def test_03_authenticated_requests_bypass_cache(
+        self, client, admin_client, django_assert_max_num_queries
+    ):
+        create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        with django_assert_max_num_queries(5) as context:
+            admin_client.get(self.TITLES_URL)
+        assert len(context.captured_queries) > 0, (
+            'Проверьте, что запросы с токеном не обслуживаются из кеша.'
+        )
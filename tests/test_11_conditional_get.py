@@ -0,0 +1,131 @@
+from http import HTTPStatus
+from time import time
+
+import pytest
+from django.utils.http import http_date
+
+from tests.utils import create_comments, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ConditionalGet:
+
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_reviews_etag(self, client, admin_client, user_client,
+                             moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        review_id = create_single_review(
+            user_client, titles[0]['id'], 'Хорошо', 8
+        ).json()['id']
+
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `ETag`.'
+        )
+        assert not response.has_header('Last-Modified'), (
+            'Проверьте, что `Last-Modified` не отдается: дата публикации '
+            'не меняется при правке и удалении.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что при совпадении `If-None-Match` возвращается '
+            'ответ со статусом 304.'
+        )
+        assert not response.content
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=review_id
+            ),
+            data={'text': 'Отлично'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения отзыва `ETag` меняется.'
+        )
+        etag = response['ETag']
+
+        create_single_review(moderator_client, titles[0]['id'], 'Плохо', 2)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления отзыва `ETag` меняется.'
+        )
+
+    def test_02_comments_and_titles_etag(self, client, admin_client, admin,
+                                         user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        etag = client.get(url)['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        detail_url = f'{url}{comments[0]["id"]}/'
+        etag = client.get(detail_url)['ETag']
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        title_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        etag = client.get(title_url)['ETag']
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что ответ из кеша произведений также учитывает '
+            '`If-None-Match`.'
+        )
+        admin_client.patch(title_url, data={'name': 'Другое название'})
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_if_modified_since_after_edit(self, client, admin_client,
+                                             user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        old_review_id = create_single_review(
+            user_client, titles[0]['id'], 'Хорошо', 8
+        ).json()['id']
+        create_single_review(moderator_client, titles[0]['id'], 'Плохо', 2)
+        assert client.get(url).status_code == HTTPStatus.OK
+        if_modified_since = http_date(time() + 60)
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=old_review_id
+            ),
+            data={'text': 'Отлично'}
+        )
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=if_modified_since)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения отзыва запрос с '
+            '`If-Modified-Since` не получает ответ 304.'
+        )
+        assert 'Отлично' in [
+            review['text'] for review in response.json()['results']
+        ]
+
+        user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=old_review_id
+            )
+        )
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=if_modified_since)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после удаления не самого нового отзыва запрос '
+            'с `If-Modified-Since` не получает ответ 304.'
+        )
+        assert response.json()['count'] == 1
@@ -0,0 +1,51 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from api.serializers import TitleReadSerializer, TitleValuesSerializer
+from api.views import TitleViewSet
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleValuesSerializer:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_same_output_as_model_serializer(self, admin_client,
+                                                user_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Без категории',
+            'year': 2001,
+            'genre': ['drama'],
+        })
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+
+        queryset = TitleViewSet.queryset.all()
+        expected = JSONRenderer().render(
+            TitleReadSerializer(queryset, many=True).data
+        )
+        values = TitleValuesSerializer.get_values_queryset(queryset)
+        assert JSONRenderer().render(
+            TitleValuesSerializer(values, many=True).data
+        ) == expected, (
+            'Проверьте, что быстрый сериалайзер произведений отдает '
+            'такой же ответ, как TitleReadSerializer.'
+        )
+
+        for title in queryset:
+            row = values.get(pk=title.pk)
+            assert JSONRenderer().render(
+                TitleValuesSerializer(row).data
+            ) == JSONRenderer().render(TitleReadSerializer(title).data)
+
+    def test_02_switchable_per_view(self, client, admin_client, monkeypatch):
+        create_titles(admin_client)
+        fast = client.get(self.TITLES_URL).content
+        cache.clear()
+        monkeypatch.setattr(TitleViewSet, 'values_serializer_class', None)
+        assert client.get(self.TITLES_URL).content == fast, (
+            'Проверьте, что ответы быстрого и обычного путей чтения '
+            'произведений совпадают.'
+        )
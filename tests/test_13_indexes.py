@@ -0,0 +1,72 @@
+import pytest
+from django.db import connection
+from django.db.utils import IntegrityError
+
+from reviews.models import Comment, GenreTitle, Review, Title
+from tests.utils import create_titles
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Планы запросов проверяются на SQLite.',
+)
+
+
+def assert_uses_index(queryset, index_name):
+    plan = queryset.explain()
+    assert f'USING INDEX {index_name}' in plan, (
+        f'Проверьте, что запрос использует индекс `{index_name}`. '
+        f'План запроса: {plan}'
+    )
+    assert 'USE TEMP B-TREE FOR ORDER BY' not in plan, (
+        f'Проверьте, что индекс `{index_name}` покрывает сортировку. '
+        f'План запроса: {plan}'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Indexes:
+
+    def test_01_reviews_of_title_by_pub_date(self):
+        assert_uses_index(
+            Review.objects.filter(title_id=1),
+            'review_title_pub_date_idx',
+        )
+
+    def test_02_comments_of_review_by_pub_date(self):
+        assert_uses_index(
+            Comment.objects.filter(review_id=1),
+            'comment_review_pub_date_idx',
+        )
+
+    def test_03_titles_by_name_and_year(self):
+        assert_uses_index(Title.objects.order_by('name'), 'title_name_idx')
+        plan = Title.objects.filter(year=1984).order_by().explain()
+        assert 'USING INDEX title_year_idx' in plan, (
+            'Проверьте, что фильтрация произведений по году использует '
+            f'индекс. План запроса: {plan}'
+        )
+
+    def test_04_users_by_username_and_email(self, django_user_model):
+        # username уникален, поэтому сортировку (username, email)
+        # обслуживает уникальный индекс по username.
+        plan = django_user_model.objects.all().explain()
+        assert 'USING INDEX' in plan and 'TEMP B-TREE' not in plan, (
+            'Проверьте, что сортировка пользователей выполняется по индексу. '
+            f'План запроса: {plan}'
+        )
+
+    def test_05_genre_title_lookup(self):
+        plan = GenreTitle.objects.filter(
+            genre_id=1,
+            title_id=1,
+        ).order_by().explain()
+        assert 'INDEX' in plan and '(genre_id=? AND title_id=?)' in plan, (
+            'Проверьте, что поиск связи жанра и произведения использует '
+            f'уникальный индекс. План запроса: {plan}'
+        )
+
+    def test_06_genre_title_unique(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        link = GenreTitle.objects.filter(title_id=titles[0]['id']).first()
+        with pytest.raises(IntegrityError):
+            GenreTitle.objects.create(genre=link.genre, title=link.title)
@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметром '
+            '`search` возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_cyrillic(self, client, admin_client):
+        create_titles(admin_client)
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Ёжик в тумане',
+            'year': 1975,
+            'genre': ['drama'],
+            'description': 'Мультфильм про ежика и лошадь.',
+        })
+        assert self.search(client, 'терминатор') == ['Терминатор'], (
+            'Проверьте, что поиск по названию не зависит от регистра '
+            'и работает с кириллицей.'
+        )
+        assert self.search(client, 'креп') == ['Крепкий орешек'], (
+            'Проверьте, что поиск находит слова по началу.'
+        )
+        assert self.search(client, 'ежик') == ['Ёжик в тумане'], (
+            'Проверьте, что поиск не различает «е» и «ё».'
+        )
+        assert self.search(client, 'back') == ['Терминатор'], (
+            'Проверьте, что поиск выполняется и по описанию произведения.'
+        )
+        assert self.search(client, 'несуществующее') == []
+        assert self.search(client, '"*') == []
+
+    def test_02_search_relevance(self, client, admin_client):
+        _, _, genres = create_titles(admin_client)
+        for name, description in (
+            ('Лошадь', 'Лошадь, лошадь и ещё раз лошадь.'),
+            ('Поле', 'Где-то в поле бегает лошадь.'),
+        ):
+            admin_client.post(self.TITLES_URL, data={
+                'name': name,
+                'year': 2000,
+                'genre': [genres[0]['slug']],
+                'description': description,
+            })
+        assert self.search(client, 'лошадь') == ['Лошадь', 'Поле'], (
+            'Проверьте, что результаты поиска упорядочены по релевантности.'
+        )
+
+    def test_03_index_follows_writes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        admin_client.patch(url, data={'name': 'Робокоп'})
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'робокоп') == ['Робокоп'], (
+            'Проверьте, что изменение произведения обновляет поисковый '
+            'индекс.'
+        )
+        admin_client.delete(url)
+        assert self.search(client, 'робокоп') == [], (
+            'Проверьте, что удаление произведения удаляет его из '
+            'поискового индекса.'
+        )
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import TitleScore
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleStats:
+
+    TITLE_STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_stats(self, client, title_id):
+        response = client.get(
+            self.TITLE_STATS_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к '
+            f'`{self.TITLE_STATS_URL_TEMPLATE}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return response.json()
+
+    def test_01_empty_stats(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data = self.get_stats(client, titles[0]['id'])
+        assert data['count'] == 0
+        assert data['mean'] is None and data['median'] is None
+        assert [bar['score'] for bar in data['histogram']] == list(
+            range(1, 11)
+        ), (
+            'Проверьте, что гистограмма содержит все оценки от 1 до 10.'
+        )
+        assert client.get(
+            self.TITLE_STATS_URL_TEMPLATE.format(title_id=999)
+        ).status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_stats_follow_reviews(self, client, admin_client, user_client,
+                                     moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Хорошо', 8)
+        create_single_review(admin_client, title_id, 'Хорошо', 8)
+        review_id = create_single_review(
+            moderator_client, title_id, 'Плохо', 3
+        ).json()['id']
+
+        data = self.get_stats(client, title_id)
+        histogram = {bar['score']: bar['count'] for bar in data['histogram']}
+        assert histogram[8] == 2 and histogram[3] == 1, (
+            'Проверьте, что гистограмма оценок учитывает созданные отзывы.'
+        )
+        assert (data['count'], data['mean'], data['median']) == (
+            3, 6.33, 8
+        )
+
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+        moderator_client.patch(url, data={'score': 6})
+        data = self.get_stats(client, title_id)
+        histogram = {bar['score']: bar['count'] for bar in data['histogram']}
+        assert histogram[3] == 0 and histogram[6] == 1, (
+            'Проверьте, что изменение оценки отзыва обновляет гистограмму.'
+        )
+
+        moderator_client.delete(url)
+        data = self.get_stats(client, title_id)
+        assert (data['count'], data['mean'], data['median']) == (2, 8, 8), (
+            'Проверьте, что удаление отзыва обновляет статистику оценок.'
+        )
+
+    def test_03_rebuild(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Так себе', 5)
+        stored = list(TitleScore.objects.values_list('title', 'score', 'count'))
+        TitleScore.objects.all().delete()
+        TitleScore.objects.rebuild()
+        assert list(
+            TitleScore.objects.values_list('title', 'score', 'count')
+        ) == stored
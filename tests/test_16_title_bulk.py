@@ -0,0 +1,151 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import GenreTitle, Title
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleBulkCreate:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_BULK_URL = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_create_with_item_errors(self, client, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = [
+            {
+                'name': 'Чужой',
+                'year': 1979,
+                'genre': [genres[0]['slug'], genres[2]['slug']],
+                'category': categories[0]['slug'],
+                'description': 'В космосе никто не услышит твой крик.',
+            },
+            {
+                'name': 'Неизвестный жанр',
+                'year': 1990,
+                'genre': ['unknown'],
+                'category': categories[0]['slug'],
+            },
+            {
+                'name': 'Из будущего',
+                'year': 3000,
+                'genre': [genres[1]['slug']],
+            },
+            {
+                'name': 'Без категории',
+                'year': 2000,
+                'genre': [genres[1]['slug']],
+            },
+        ]
+        response = admin_client.post(
+            self.TITLES_BULK_URL, data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к '
+            f'`{self.TITLES_BULK_URL}` возвращает ответ со статусом 201, '
+            'если хотя бы одно произведение создано.'
+        )
+        result = response.json()
+        assert [title['name'] for title in result['created']] == [
+            'Чужой', 'Без категории'
+        ]
+        assert [error['index'] for error in result['errors']] == [1, 2], (
+            'Проверьте, что ошибки возвращаются для каждого элемента '
+            'пакета отдельно.'
+        )
+        assert 'genre' in result['errors'][0]['errors']
+        assert 'year' in result['errors'][1]['errors']
+
+        alien = result['created'][0]
+        assert alien['category'] == categories[0]
+        assert alien['genre'] == sorted(
+            [genres[0], genres[2]], key=lambda genre: genre['name']
+        )
+        assert GenreTitle.objects.filter(title_id=alien['id']).count() == 2
+
+        response = client.get(self.TITLES_URL, {'search': 'чужой'})
+        assert response.json()['results'][0]['id'] == alien['id'], (
+            'Проверьте, что произведения из пакета попадают в поисковый '
+            'индекс.'
+        )
+
+    def test_02_query_count_does_not_grow(self, admin_client,
+                                          django_assert_max_num_queries):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+
+        def make_batch(size):
+            return [
+                {
+                    'name': f'Произведение {idx}',
+                    'year': 2000,
+                    'genre': [genre['slug'] for genre in genres],
+                    'category': categories[idx % 2]['slug'],
+                }
+                for idx in range(size)
+            ]
+
+        with django_assert_max_num_queries(20) as small:
+            admin_client.post(
+                self.TITLES_BULK_URL, data=make_batch(2), format='json'
+            )
+        with django_assert_max_num_queries(20) as large:
+            admin_client.post(
+                self.TITLES_BULK_URL, data=make_batch(50), format='json'
+            )
+        assert len(large.captured_queries) == len(small.captured_queries), (
+            'Проверьте, что количество запросов к БД при пакетном создании '
+            'не зависит от размера пакета.'
+        )
+        assert Title.objects.count() == 52
+
+    def test_03_bulk_permissions_and_payload(self, user_client,
+                                             admin_client):
+        response = user_client.post(
+            self.TITLES_BULK_URL, data=[], format='json'
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.post(
+            self.TITLES_BULK_URL, data={'name': 'Не список'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(
+            self.TITLES_BULK_URL,
+            data=[{'name': 'Без года', 'genre': []}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()['created'] == []
+
+    def test_04_duplicate_genres(self, admin_client):
+        genres = create_genre(admin_client)
+        data = [
+            {
+                'name': 'Повтор жанра',
+                'year': 2000,
+                'genre': [genres[0]['slug'], genres[0]['slug']],
+            },
+            {
+                'name': 'Неизвестный жанр',
+                'year': 2000,
+                'genre': ['unknown', 'unknown'],
+            },
+        ]
+        response = admin_client.post(
+            self.TITLES_BULK_URL, data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что повтор жанра в элементе пакета не приводит '
+            'к ошибке сервера.'
+        )
+        result = response.json()
+        assert [error['index'] for error in result['errors']] == [1]
+        title_id = result['created'][0]['id']
+        assert result['created'][0]['genre'] == [genres[0]]
+        assert GenreTitle.objects.filter(title_id=title_id).count() == 1, (
+            'Проверьте, что повторяющиеся жанры связываются с '
+            'произведением один раз.'
+        )
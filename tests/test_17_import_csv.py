@@ -0,0 +1,86 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import Avg
+
+from api.cache import get_token_version_cache_key, get_user_cache_key
+from reviews.models import Comment, Genre, GenreTitle, Review, Title
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ImportCSV:
+
+    def import_csv(self, **options):
+        out = StringIO()
+        call_command('import_csv', stdout=out, **options)
+        return out.getvalue()
+
+    def get_counts(self):
+        return [
+            model.objects.count()
+            for model in (User, Genre, Title, GenreTitle, Review, Comment)
+        ]
+
+    def test_01_import_static_data(self):
+        output = self.import_csv(batch_size=7)
+        assert 'строк/с' in output, (
+            'Проверьте, что команда `import_csv` сообщает скорость загрузки.'
+        )
+        assert self.get_counts() == [5, 15, 32, 42, 72, 3]
+
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что при загрузке сохраняется дата публикации из '
+            'файла.'
+        )
+        title = Title.objects.get(pk=1)
+        expected = int(title.reviews.aggregate(value=Avg('score'))['value'])
+        assert title.rating == expected, (
+            'Проверьте, что после загрузки пересчитывается рейтинг '
+            'произведений.'
+        )
+        assert title.scores.exists()
+
+    def test_02_import_is_idempotent(self):
+        self.import_csv()
+        counts = self.get_counts()
+        Title.objects.filter(pk=1).update(name='Испорчено')
+        self.import_csv(batch_size=3)
+        assert self.get_counts() == counts, (
+            'Проверьте, что повторная загрузка не создает дубликатов.'
+        )
+        assert Title.objects.get(pk=1).name == 'Побег из Шоушенка', (
+            'Проверьте, что повторная загрузка обновляет существующие '
+            'записи.'
+        )
+
+    def test_03_reimport_revokes_changed_roles(self):
+        self.import_csv()
+        User.objects.filter(pk=100).update(role='admin')
+        keys = [
+            get_user_cache_key(100),
+            get_token_version_cache_key(100),
+            get_user_cache_key(101),
+        ]
+        cache.set_many({key: 'cached' for key in keys})
+        versions = dict(User.objects.values_list('pk', 'token_version'))
+
+        self.import_csv()
+
+        user = User.objects.get(pk=100)
+        assert user.role == 'user'
+        assert user.token_version == versions[100] + 1, (
+            'Проверьте, что повторная загрузка, меняющая роль пользователя, '
+            'отзывает его токены.'
+        )
+        assert User.objects.get(pk=101).token_version == versions[101], (
+            'Проверьте, что повторная загрузка не отзывает токены '
+            'пользователей с прежней ролью.'
+        )
+        assert not cache.get_many(keys), (
+            'Проверьте, что повторная загрузка очищает кеш пользователей '
+            'и версий их токенов.'
+        )
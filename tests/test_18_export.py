@@ -0,0 +1,102 @@
+import csv
+import gzip
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.models import Title
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Export:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/export/{resource}/'
+
+    def get_export(self, client, resource, **params):
+        response = client.get(
+            self.EXPORT_URL_TEMPLATE.format(resource=resource), params
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос администратора к '
+            f'`{self.EXPORT_URL_TEMPLATE}` возвращает ответ со статусом 200.'
+        )
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдается потоковым ответом.'
+        )
+        return response, b''.join(response.streaming_content)
+
+    def test_01_export_ndjson_and_csv(self, admin_client, admin, user,
+                                      user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        _, content = self.get_export(admin_client, 'titles')
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        assert [row['name'] for row in rows] == [
+            title['name'] for title in titles
+        ], (
+            'Проверьте, что выгрузка NDJSON содержит все произведения.'
+        )
+
+        response, content = self.get_export(
+            admin_client, 'reviews', type='csv'
+        )
+        assert response['Content-Type'] == 'text/csv'
+        rows = list(csv.DictReader(content.decode().splitlines()))
+        assert sorted(int(row['id']) for row in rows) == sorted(
+            review['id'] for review in reviews
+        )
+        assert rows[0]['pub_date']
+
+        response, content = self.get_export(
+            admin_client, 'comments', compress='gzip'
+        )
+        assert response['Content-Type'] == 'application/gzip'
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что сжатая выгрузка отдается файлом .gz без '
+            '`Content-Encoding`, чтобы клиент не распаковывал ее.'
+        )
+        assert 'comments.ndjson.gz' in response['Content-Disposition']
+        lines = gzip.decompress(content).decode().splitlines()
+        assert len(lines) == len(comments), (
+            'Проверьте, что выгрузка поддерживает сжатие gzip.'
+        )
+
+    def test_02_export_permissions(self, client, user_client, admin_client):
+        url = self.EXPORT_URL_TEMPLATE.format(resource='titles')
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+        assert admin_client.get(
+            self.EXPORT_URL_TEMPLATE.format(resource='users')
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert admin_client.get(
+            url, {'type': 'xml'}
+        ).status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_export_command(self, admin_client, admin, tmp_path):
+        create_comments(admin_client, {admin: admin_client})
+        call_command('export_data', output=str(tmp_path), gzip=True)
+        for resource in ('titles', 'reviews', 'comments'):
+            with gzip.open(tmp_path / f'{resource}.ndjson.gz', 'rt') as file:
+                assert all(json.loads(line)['id'] for line in file), (
+                    'Проверьте, что команда `export_data` выгружает '
+                    f'таблицу `{resource}`.'
+                )
+
+    def test_04_export_command_stdout(self, admin_client, admin):
+        create_comments(admin_client, {admin: admin_client})
+        out = StringIO()
+        call_command('export_data', 'titles', stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert len(rows) == Title.objects.count(), (
+            'Проверьте, что без `--output` команда `export_data` пишет '
+            'выгрузку в self.stdout.'
+        )
+        with pytest.raises(CommandError):
+            call_command('export_data', 'titles', 'reviews', stdout=out)
+        with pytest.raises(CommandError):
+            call_command('export_data', stdout=out)
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import TopTitle
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TopTitles:
+
+    GENRE_TOP_URL_TEMPLATE = '/api/v1/genres/{slug}/top/'
+    CATEGORY_TOP_URL_TEMPLATE = '/api/v1/categories/{slug}/top/'
+
+    def get_top(self, client, url_template, slug):
+        url = url_template.format(slug=slug)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url_template}` возвращает ответ '
+            'со статусом 200.'
+        )
+        return [
+            (title['id'], title['review_count'])
+            for title in response.json()['results']
+        ]
+
+    def test_01_top_follows_reviews(self, client, admin_client, user_client,
+                                    moderator_client, user_superuser_client):
+        titles, _, _ = create_titles(admin_client)
+        terminator, die_hard = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, terminator, 'Хорошо', 8)
+        create_single_review(admin_client, terminator, 'Хорошо', 8)
+        review_id = create_single_review(
+            moderator_client, terminator, 'Плохо', 3
+        ).json()['id']
+        create_single_review(user_client, die_hard, 'Отлично', 10)
+        create_single_review(admin_client, die_hard, 'Отлично', 10)
+
+        assert self.get_top(
+            client, self.GENRE_TOP_URL_TEMPLATE, 'horror'
+        ) == [(terminator, 3)], (
+            'Проверьте, что рейтинг жанра содержит произведения, набравшие '
+            'минимальное количество отзывов.'
+        )
+        assert self.get_top(
+            client, self.CATEGORY_TOP_URL_TEMPLATE, 'films'
+        ) == [(terminator, 3)]
+        assert self.get_top(
+            client, self.GENRE_TOP_URL_TEMPLATE, 'drama'
+        ) == [], (
+            'Проверьте, что в рейтинг не попадают произведения с малым '
+            'количеством отзывов.'
+        )
+
+        create_single_review(moderator_client, die_hard, 'Отлично', 10)
+        response = admin_client.patch(
+            f'/api/v1/titles/{terminator}/', data={'genre': ['drama']}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_top(
+            client, self.GENRE_TOP_URL_TEMPLATE, 'drama'
+        ) == [(die_hard, 3), (terminator, 3)], (
+            'Проверьте, что рейтинг жанра обновляется при изменении отзывов '
+            'и жанров произведения.'
+        )
+        assert self.get_top(
+            client, self.GENRE_TOP_URL_TEMPLATE, 'horror'
+        ) == []
+
+        moderator_client.delete(
+            f'/api/v1/titles/{terminator}/reviews/{review_id}/'
+        )
+        assert self.get_top(
+            client, self.CATEGORY_TOP_URL_TEMPLATE, 'films'
+        ) == []
+        assert self.get_top(
+            client, self.CATEGORY_TOP_URL_TEMPLATE, 'books'
+        ) == [(die_hard, 3)]
+
+        admin_client.delete(f'/api/v1/titles/{die_hard}/')
+        assert not TopTitle.objects.exists(), (
+            'Проверьте, что при удалении произведения удаляются и его '
+            'строки рейтинга.'
+        )
+
+    def test_02_top_is_single_query(self, client, admin_client, user_client,
+                                    moderator_client,
+                                    django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        for author_client in (user_client, admin_client, moderator_client):
+            create_single_review(author_client, titles[0]['id'], 'Текст', 5)
+        url = self.GENRE_TOP_URL_TEMPLATE.format(slug='comedy')
+        with django_assert_num_queries(1):
+            response = client.get(url)
+        assert response.json()['results'][0]['score'] == 5
+        assert client.get(
+            self.GENRE_TOP_URL_TEMPLATE.format(slug='unknown')
+        ).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,162 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from api_yamdb.settings import EMAIL_OUTBOX_MAX_ATTEMPTS
+from users.models import OutboxEmail
+
+
+class TrackingEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд со счетчиком открытых соединений.
+
+    Как SMTP, без открытого соединения открывает его на одно письмо.
+    """
+
+    opened = 0
+    failing_recipients = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connection = None
+
+    def open(self):
+        if self.connection is not None:
+            return False
+        self.connection = object()
+        TrackingEmailBackend.opened += 1
+        return True
+
+    def close(self):
+        self.connection = None
+
+    def send_messages(self, email_messages):
+        new_connection = self.open()
+        try:
+            for message in email_messages:
+                if message.to[0] in self.failing_recipients:
+                    raise ConnectionError('Соединение оборвано')
+                mail.outbox.append(message)
+        finally:
+            if new_connection:
+                self.close()
+        return len(email_messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    TRACKING_BACKEND = 'tests.test_20_email_outbox.TrackingEmailBackend'
+
+    def send_emails(self, **options):
+        out = StringIO()
+        call_command('send_emails', stdout=out, **options)
+        return out.getvalue()
+
+    def signup(self, client, idx):
+        return client.post(self.URL_SIGNUP, data={
+            'email': f'outbox{idx}@yamdb.fake',
+            'username': f'outbox{idx}',
+        })
+
+    def test_01_signup_enqueues_email(self, client, settings):
+        mail.outbox = []
+        for idx in range(5):
+            self.signup(client, idx)
+        assert mail.outbox == [], (
+            'Проверьте, что письмо с кодом подтверждения не отправляется '
+            'во время запроса к `/api/v1/auth/signup/`.'
+        )
+        assert OutboxEmail.objects.filter(
+            status=OutboxEmail.PENDING
+        ).count() == 5, (
+            'Проверьте, что регистрация ставит письмо в очередь.'
+        )
+
+        settings.EMAIL_BACKEND = self.TRACKING_BACKEND
+        TrackingEmailBackend.opened = 0
+        output = self.send_emails(batch_size=2)
+        assert 'Отправлено писем: 5' in output
+        assert TrackingEmailBackend.opened == 1, (
+            'Проверьте, что все пачки писем отправляются через одно '
+            'соединение с почтовым бэкендом.'
+        )
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'outbox{idx}@yamdb.fake' for idx in range(5)
+        ]
+        assert not OutboxEmail.objects.exclude(
+            status=OutboxEmail.SENT
+        ).exists()
+        self.send_emails()
+        assert len(mail.outbox) == 5, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_retry_with_backoff(self, client, monkeypatch):
+        mail.outbox = []
+        self.signup(client, 0)
+
+        def broken_send(backend, messages):
+            raise ConnectionError('SMTP недоступен')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', broken_send)
+        self.send_emails()
+        email = OutboxEmail.objects.get()
+        assert email.status == OutboxEmail.PENDING
+        assert email.attempts == 1 and 'SMTP' in email.last_error
+        first_delay = email.next_attempt_at - timezone.now()
+        assert first_delay > timedelta(0), (
+            'Проверьте, что повторная попытка откладывается.'
+        )
+        self.send_emails()
+        assert OutboxEmail.objects.get().attempts == 1, (
+            'Проверьте, что письмо не отправляется до наступления '
+            'времени следующей попытки.'
+        )
+
+        for attempt in range(2, EMAIL_OUTBOX_MAX_ATTEMPTS + 1):
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            self.send_emails()
+            email = OutboxEmail.objects.get()
+            assert email.attempts == attempt
+            if attempt == 2:
+                assert email.next_attempt_at - timezone.now() > first_delay, (
+                    'Проверьте, что задержка между попытками растет.'
+                )
+        monkeypatch.undo()
+        assert email.status == OutboxEmail.FAILED, (
+            'Проверьте, что после исчерпания попыток письмо помечается '
+            'как неотправленное.'
+        )
+
+        self.signup(client, 0)
+        self.send_emails()
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что после восстановления бэкенда письма '
+            'отправляются.'
+        )
+
+    def test_03_connection_reused_after_failure(self, client, settings,
+                                                monkeypatch):
+        mail.outbox = []
+        for idx in range(4):
+            self.signup(client, idx)
+        settings.EMAIL_BACKEND = self.TRACKING_BACKEND
+        monkeypatch.setattr(
+            TrackingEmailBackend,
+            'failing_recipients',
+            ('outbox1@yamdb.fake',),
+        )
+        TrackingEmailBackend.opened = 0
+        output = self.send_emails(batch_size=2)
+        assert 'Отправлено писем: 3, неудачных попыток: 1' in output
+        assert TrackingEmailBackend.opened == 2, (
+            'Проверьте, что после ошибки отправки соединение открывается '
+            'заново и переиспользуется следующими пачками писем.'
+        )
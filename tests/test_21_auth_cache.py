@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from api.cache import get_user_cache_key
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21AuthCache:
+
+    USERS_URL = '/api/v1/users/'
+    USERS_ME_URL = '/api/v1/users/me/'
+    USER_DETAIL_URL_TEMPLATE = '/api/v1/users/{username}/'
+
+    def test_01_user_is_cached(self, user_client, user,
+                               django_assert_num_queries):
+        assert user_client.get(self.USERS_ME_URL).status_code == (
+            HTTPStatus.OK
+        )
+        with django_assert_num_queries(0):
+            response = user_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что пользователь из JWT-токена берется из кеша без '
+            'запроса к БД.'
+        )
+        cached = cache.get(get_user_cache_key(user.pk))
+        assert 'password' not in cached and 'email' not in cached, (
+            'Проверьте, что в кеше хранятся только поля, нужные для '
+            'проверки прав, без пароля и профиля.'
+        )
+        response = user_client.get(self.USERS_ME_URL)
+        assert response.json()['email'] == user.email, (
+            'Проверьте, что `/api/v1/users/me/` загружает профиль '
+            'пользователя из кеша.'
+        )
+
+        response = user_client.patch(self.USERS_ME_URL, data={'bio': 'Новое'})
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get(self.USERS_ME_URL).json()['bio'] == 'Новое', (
+            'Проверьте, что после изменения профиля кеш пользователя '
+            'сбрасывается.'
+        )
+
+    def test_02_role_change_invalidates_cache(self, admin_client,
+                                              user_client, user):
+        assert user_client.get(self.USERS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        url = self.USER_DETAIL_URL_TEMPLATE.format(username=user.username)
+        response = admin_client.patch(url, data={'role': 'admin'})
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get(self.USERS_URL).status_code == HTTPStatus.OK, (
+            'Проверьте, что смена роли через `/api/v1/users/{username}/` '
+            'действует со следующего запроса пользователя.'
+        )
+
+        user.refresh_from_db()
+        user.role = 'user'
+        user.is_superuser = True
+        user.save()
+        assert user_client.get(self.USERS_URL).status_code == HTTPStatus.OK
+        user.is_superuser = False
+        user.save()
+        assert user_client.get(self.USERS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), (
+            'Проверьте, что изменение `is_superuser` сбрасывает кеш '
+            'пользователя.'
+        )
+
+    def test_03_deactivation_invalidates_cache(self, user_client, user):
+        assert user_client.get(self.USERS_ME_URL).status_code == (
+            HTTPStatus.OK
+        )
+        user.is_active = False
+        user.save()
+        assert user_client.get(self.USERS_ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что деактивированный пользователь не проходит '
+            'аутентификацию.'
+        )
+        user.delete()
+        assert user_client.get(self.USERS_ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
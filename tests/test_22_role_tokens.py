@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22RoleTokens:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+    USERS_URL = '/api/v1/users/'
+    USERS_ME_URL = '/api/v1/users/me/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    @pytest.fixture(autouse=True)
+    def role_claims(self, monkeypatch):
+        monkeypatch.setattr('api.authentication.JWT_ROLE_CLAIMS', True)
+
+    def get_client(self, user):
+        response = APIClient().post(self.URL_TOKEN, data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = response.json()['token']
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client, AccessToken(token)
+
+    def test_01_token_carries_role(self, admin,
+                                   django_assert_num_queries):
+        client, token = self.get_client(admin)
+        assert (token['role'], token['token_version']) == ('admin', 0), (
+            'Проверьте, что в режиме JWT_ROLE_CLAIMS токен содержит роль '
+            'и версию токенов пользователя.'
+        )
+        client.get(self.USERS_URL)
+        # Проверка уникальности слага и вставка: пользователь берется из
+        # токена, версия токенов - из кеша.
+        with django_assert_num_queries(2):
+            response = client.post(
+                self.CATEGORIES_URL, data={'name': 'Игры', 'slug': 'games'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = client.get(self.USERS_ME_URL)
+        assert response.json()['email'] == admin.email, (
+            'Проверьте, что `/api/v1/users/me/` возвращает полные данные '
+            'пользователя из токена с ролью.'
+        )
+
+    def test_02_role_change_revokes_token(self, admin_client, user):
+        client, _ = self.get_client(user)
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(self.USERS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что после смены роли выданные ранее токены с ролью '
+            'отклоняются.'
+        )
+        client, token = self.get_client(user)
+        assert token['token_version'] == 1
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.OK
+
+        user.refresh_from_db()
+        user.bio = 'Без смены прав'
+        user.save()
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение полей, не влияющих на права, не '
+            'отзывает токены.'
+        )
+        user.is_active = False
+        user.save()
+        assert client.get(self.USERS_ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_03_writes_with_role_token(self, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        client, _ = self.get_client(user)
+        response = client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            data={'text': 'Отзыв', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username, (
+            'Проверьте, что пользователь из токена с ролью может быть '
+            'автором отзыва.'
+        )
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from api.permissions import IsAuthorModeratorOrAdmin
+from reviews.models import Comment, Review
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ObjectPermissions:
+
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/'
+    )
+
+    def check_no_user_queries(self, captured, url):
+        assert not [
+            query['sql'] for query in captured.captured_queries
+            if 'FROM "users_user"' in query['sql']
+        ], (
+            f'Проверьте, что при запросе к `{url}` автор объекта не '
+            'загружается из БД для проверки прав.'
+        )
+
+    def test_01_permission_without_queries(self, admin_client, admin, user,
+                                           user_client, moderator,
+                                           django_assert_num_queries):
+        create_comments(admin_client, {admin: admin_client, user: user_client})
+        request = APIRequestFactory().patch('/')
+        permission = IsAuthorModeratorOrAdmin()
+        for model in (Review, Comment):
+            obj = model.objects.filter(author=user).first()
+            for request_user, allowed in (
+                (user, True), (moderator, True), (admin, True)
+            ):
+                request.user = request_user
+                with django_assert_num_queries(0):
+                    assert permission.has_object_permission(
+                        request, None, obj
+                    ) is allowed
+            obj = model.objects.filter(author=admin).first()
+            request.user = user
+            with django_assert_num_queries(0):
+                assert not permission.has_object_permission(
+                    request, None, obj
+                ), (
+                    'Проверьте, что пользователь не может изменять чужие '
+                    'отзывы и комментарии.'
+                )
+
+    def test_02_moderation_query_count(self, admin_client, admin, user,
+                                       user_client, moderator_client,
+                                       django_assert_max_num_queries):
+        create_comments(admin_client, {admin: admin_client, user: user_client})
+        moderator_client.get('/api/v1/users/me/')
+        review = Review.objects.filter(author=user).first()
+        comment = Comment.objects.filter(author=user).first()
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=review.title_id, review_id=review.pk
+        )
+        comment_url = self.COMMENT_DETAIL_URL_TEMPLATE.format(
+            title_id=comment.review.title_id,
+            review_id=comment.review_id,
+            comment_id=comment.pk,
+        )
+
+        # комментарий с автором + обновление
+        with django_assert_max_num_queries(2) as captured:
+            response = moderator_client.patch(
+                comment_url, data={'text': 'Отмодерировано'}
+            )
+        assert response.status_code == HTTPStatus.OK
+        self.check_no_user_queries(captured, comment_url)
+
+        # комментарий + удаление в транзакции
+        with django_assert_max_num_queries(3) as captured:
+            response = moderator_client.delete(comment_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        self.check_no_user_queries(captured, comment_url)
+
+        # отзыв с автором + блокировка строки и обновление в транзакции
+        # Review.save
+        with django_assert_max_num_queries(4) as captured:
+            response = moderator_client.patch(
+                review_url, data={'text': 'Отмодерировано'}
+            )
+        assert response.status_code == HTTPStatus.OK
+        self.check_no_user_queries(captured, review_url)
+
+        with django_assert_max_num_queries(20) as captured:
+            response = moderator_client.delete(review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        self.check_no_user_queries(captured, review_url)
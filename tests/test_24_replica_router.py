@@ -0,0 +1,162 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connections, router
+from django.test.utils import CaptureQueriesContext
+
+from api.db_routers import use_read_database
+from reviews.models import Title
+from tests.utils import create_titles
+from users.models import User
+
+REPLICAS = ('replica1', 'replica2')
+USER_TABLE = User._meta.db_table
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ReplicaRouter:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, monkeypatch):
+        # Реплики - зеркала тестовой базы в памяти: те же данные,
+        # но отдельные алиасы и соединения.
+        for alias in REPLICAS:
+            connections.settings[alias] = dict(
+                connections['default'].settings_dict
+            )
+        monkeypatch.setattr('api.db_routers.DATABASE_REPLICAS', list(REPLICAS))
+        yield
+        for alias in REPLICAS:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+
+    def get_read_databases(self, request):
+        contexts = {
+            alias: CaptureQueriesContext(connections[alias])
+            for alias in ('default', *REPLICAS)
+        }
+        for context in contexts.values():
+            context.__enter__()
+        try:
+            response = request()
+        finally:
+            for context in contexts.values():
+                context.__exit__(None, None, None)
+        assert response.status_code == HTTPStatus.OK
+        # Пользователь загружается аутентификацией до выбора реплики,
+        # поэтому учитываются только чтения данных API.
+        return response, {
+            alias for alias, context in contexts.items()
+            if any(
+                query['sql'].lstrip().upper().startswith('SELECT')
+                and USER_TABLE not in query['sql']
+                for query in context.captured_queries
+            )
+        }
+
+    def test_01_router(self):
+        assert Title.objects.all().db == 'default', (
+            'Проверьте, что вне запросов чтение идет из основной базы.'
+        )
+        with use_read_database('replica2'):
+            assert Title.objects.all().db == 'replica2'
+            assert router.db_for_write(Title) == 'default', (
+                'Проверьте, что запись всегда идет в основную базу.'
+            )
+        assert Title.objects.all().db == 'default'
+
+    def test_02_safe_methods_read_from_replica(self, client, user_client):
+        _, databases = self.get_read_databases(
+            lambda: client.get(self.TITLES_URL)
+        )
+        assert len(databases) == 1 and databases < set(REPLICAS), (
+            'Проверьте, что GET-запросы к `/api/v1/titles/` читают данные '
+            'из реплики.'
+        )
+        _, databases = self.get_read_databases(
+            lambda: client.get(self.TITLES_URL)
+        )
+        assert not databases, (
+            'Проверьте, что без недавней записи ответ из реплики '
+            'кешируется.'
+        )
+        _, databases = self.get_read_databases(
+            lambda: user_client.get(self.TITLES_URL)
+        )
+        assert databases and databases < set(REPLICAS)
+        assert Title.objects.all().db == 'default', (
+            'Проверьте, что после запроса выбор реплики сбрасывается.'
+        )
+
+    def test_03_reads_stick_to_primary_after_write(self, admin_client,
+                                                   user_client,
+                                                   moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = user_client.post(url, data={'text': 'Текст', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        response, databases = self.get_read_databases(
+            lambda: user_client.get(url)
+        )
+        assert databases == {'default'}, (
+            'Проверьте, что после записи чтения пользователя на время идут '
+            'в основную базу.'
+        )
+        assert response.json()['count'] == 1
+        _, databases = self.get_read_databases(
+            lambda: user_client.get(self.TITLES_URL)
+        )
+        assert databases == {'default'}
+        response, databases = self.get_read_databases(
+            lambda: moderator_client.get(url)
+        )
+        assert databases and databases < set(REPLICAS), (
+            'Проверьте, что запись одного пользователя не переключает '
+            'чтения других пользователей.'
+        )
+        assert response.json()['count'] == 1
+
+    def test_04_failed_write_does_not_stick(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        response = user_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Новое'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        _, databases = self.get_read_databases(
+            lambda: user_client.get(self.TITLES_URL)
+        )
+        assert databases and databases < set(REPLICAS), (
+            'Проверьте, что неудачная запись не переключает чтения '
+            'пользователя в основную базу.'
+        )
+
+    def test_05_lagging_replica_reads_are_not_cached(self, client,
+                                                     admin_client):
+        titles, _, _ = create_titles(admin_client)
+        for _ in range(2):
+            response, databases = self.get_read_databases(
+                lambda: client.get(self.TITLES_URL)
+            )
+            assert databases and databases < set(REPLICAS), (
+                'Проверьте, что после смены данных анонимные чтения '
+                'по-прежнему идут в реплики.'
+            )
+            assert 'ETag' not in response, (
+                'Проверьте, что ответ из реплики сразу после смены данных '
+                'отдается без ETag.'
+            )
+        assert response.json()['count'] == len(titles)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        response, databases = self.get_read_databases(
+            lambda: client.get(reviews_url)
+        )
+        assert databases and databases < set(REPLICAS)
+        assert 'ETag' in response, (
+            'Проверьте, что запись произведений не отключает ETag отзывов.'
+        )
@@ -0,0 +1,55 @@
+import sqlite3
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from api.sqlite import apply_pragmas
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='PRAGMA проверяются на SQLite.',
+)
+@pytest.mark.django_db(transaction=True)
+class Test25SQLitePragmas:
+
+    def get_pragma(self, db_connection, name):
+        return db_connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+    def test_01_connection_is_configured(self):
+        connection.ensure_connection()
+        raw_connection = connection.connection
+        assert self.get_pragma(raw_connection, 'busy_timeout') == 5000, (
+            'Проверьте, что новые соединения с SQLite получают PRAGMA из '
+            '`SQLITE_PRAGMAS`.'
+        )
+        assert self.get_pragma(raw_connection, 'cache_size') == -64000
+        assert self.get_pragma(raw_connection, 'temp_store') == 2
+
+    def test_02_file_database_uses_wal(self, tmp_path):
+        raw_connection = sqlite3.connect(
+            str(tmp_path / 'db.sqlite3'), isolation_level=None
+        )
+        apply_pragmas(raw_connection)
+        assert self.get_pragma(raw_connection, 'journal_mode') == 'wal', (
+            'Проверьте, что файловая база SQLite переводится в режим WAL.'
+        )
+        assert self.get_pragma(raw_connection, 'synchronous') == 1
+        raw_connection.close()
+
+    def test_03_benchmark_command(self):
+        out = StringIO()
+        call_command(
+            'benchmark_sqlite',
+            readers=2,
+            writers=1,
+            duration=0.2,
+            rows=100,
+            stdout=out,
+        )
+        assert 'SQLITE_PRAGMAS' in out.getvalue(), (
+            'Проверьте, что команда `benchmark_sqlite` сравнивает режимы '
+            'SQLite.'
+        )
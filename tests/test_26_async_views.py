@@ -0,0 +1,132 @@
+import asyncio
+import gzip
+from http import HTTPStatus
+from io import StringIO
+from urllib.parse import urlencode
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import resolve
+
+from api_yamdb.settings import ASGI_URLCONF
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26AsyncViews:
+
+    def async_request(self, method, url, **kwargs):
+        async def request():
+            response = await getattr(AsyncClient(), method)(url, **kwargs)
+            if response.streaming:
+                # Как ASGIHandler, потоковый ответ читается в цикле событий.
+                response.streaming_content = [
+                    b''.join(response.streaming_content)
+                ]
+            return response
+
+        return async_to_sync(request)()
+
+    def test_01_async_reads_match_sync(self, client, admin_client, admin,
+                                       user, user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        comment_url = f'{review_url}comments/{comments[0]["id"]}/'
+        for url in (
+            '/api/v1/titles/',
+            title_url,
+            f'{title_url}reviews/',
+            review_url,
+            f'{review_url}comments/',
+            comment_url,
+        ):
+            assert asyncio.iscoroutinefunction(
+                resolve(url, urlconf=ASGI_URLCONF).func
+            ), (
+                f'Проверьте, что под ASGI `{url}` обслуживает асинхронное '
+                'представление.'
+            )
+            response = self.async_request('get', url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json() == client.get(url).json(), (
+                f'Проверьте, что асинхронный GET-запрос к `{url}` возвращает '
+                'те же данные, что и синхронный.'
+            )
+        assert self.async_request(
+            'get', '/api/v1/titles/0/reviews/'
+        ).status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_async_views_accept_writes(self, admin_client, token_user):
+        title_id = admin_client.post(
+            '/api/v1/titles/', data={'name': 'Тест', 'year': 2000}
+        ).json()['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        response = self.async_request(
+            'post',
+            url,
+            data={'text': 'Отзыв', 'score': 7},
+            content_type='application/json',
+            authorization=f'Bearer {token_user["access"]}',
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что под ASGI POST-запрос к `/api/v1/titles/'
+            '{title_id}/reviews/` создает отзыв.'
+        )
+        assert self.async_request('get', url).json()['count'] == 1
+
+    def test_03_async_export(self, admin_client, token_admin):
+        create_titles(admin_client)
+        url = '/api/v1/export/titles/'
+        assert asyncio.iscoroutinefunction(
+            resolve(url, urlconf=ASGI_URLCONF).func
+        ), (
+            'Проверьте, что под ASGI выгрузку обслуживает асинхронное '
+            'представление.'
+        )
+        for params in ({}, {'type': 'csv', 'compress': 'gzip'}):
+            # AsyncClient в Django 3.2 теряет data GET-запроса,
+            # поэтому параметры передаются в адресе.
+            response = self.async_request(
+                'get',
+                f'{url}?{urlencode(params)}',
+                authorization=f'Bearer {token_admin["access"]}',
+            )
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что под ASGI выгрузка `/api/v1/export/titles/` '
+                'возвращает ответ со статусом 200.'
+            )
+            expected = admin_client.get(url, params)
+            contents = [
+                b''.join(item.streaming_content)
+                for item in (response, expected)
+            ]
+            if params.get('compress'):
+                contents = [gzip.decompress(item) for item in contents]
+            assert contents[0] == contents[1], (
+                'Проверьте, что под ASGI выгрузка совпадает с выгрузкой '
+                'через WSGI.'
+            )
+            for header in ('Content-Type', 'Content-Disposition'):
+                assert response[header] == expected[header]
+
+    def test_04_benchmark_command(self, user):
+        out = StringIO()
+        call_command(
+            'benchmark_asgi',
+            '/api/v1/titles/',
+            concurrency=4,
+            requests=8,
+            stdout=out,
+        )
+        assert 'запросов/с' in out.getvalue(), (
+            'Проверьте, что команда `benchmark_asgi` сравнивает WSGI и ASGI.'
+        )
+        assert f'Запросы от имени {user.username}' in out.getvalue(), (
+            'Проверьте, что команда `benchmark_asgi` по умолчанию '
+            'обходит кеш анонимных ответов.'
+        )